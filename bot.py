@@ -24,7 +24,17 @@ from dateutil import parser
 # ──────────────────────────────────────────────────────────────
 # 📦 Modules internes
 # ──────────────────────────────────────────────────────────────
-from supabase_client import supabase
+from utils.instance_lease import InstanceLease
+from utils.card_catalog import CardCatalog
+from utils.http_client import create_http_session
+from utils.loop_watchdog import LoopWatchdog
+from utils.streak_buffer import StreakBuffer
+from utils.leaderboard import Leaderboard
+from utils.user_cache import UserCache
+from utils.tournoi_info import TournoiInfoCache
+from utils.interaction_dispatcher import InteractionDispatcher
+from utils.outbound import OutboundScheduler
+from utils.art_cache import ArtCache
 
 # ──────────────────────────────────────────────────────────────
 # 🔧 Initialisation de l’environnement
@@ -41,9 +51,10 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 COMMAND_PREFIX = os.getenv("COMMAND_PREFIX", "!")
 INSTANCE_ID = str(uuid.uuid4())
 
-# Enregistrer cette instance
-with open("instance_id.txt", "w") as f:
-    f.write(INSTANCE_ID)
+# Enregistrer cette instance (pas depuis les processus de rendu, qui importent ce fichier)
+if __name__ == "__main__":
+    with open("instance_id.txt", "w") as f:
+        f.write(INSTANCE_ID)
 
 # Fonction pour le préfixe dynamique (ici statique)
 def get_prefix(bot, message):
@@ -59,7 +70,18 @@ intents.members = True
 intents.reactions = True
 
 bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
-bot.is_main_instance = False
+bot.is_main_instance = False                   # 🔐 Tenu à jour par bot.instance_lease (sans I/O)
+bot.instance_lease = InstanceLease(bot, INSTANCE_ID)
+bot.http_session = None                        # 🌐 Session HTTP partagée (créée au lancement)
+bot.card_catalog = CardCatalog(language="fr")  # 📚 Catalogue de cartes partagé par tous les cogs
+bot.loop_watchdog = LoopWatchdog()             # 🐕 Détection des blocages de la boucle asyncio
+bot.streak_buffer = StreakBuffer()             # 📝 Séries !question / !illustration écrites en différé
+bot.leaderboard = Leaderboard()                # 🏆 Classements des séries tenus en mémoire
+bot.user_cache = UserCache(bot)                # 👤 Noms / profils Discord sans fetch_user à chaque fois
+bot.tournoi_info = TournoiInfoCache()          # 📅 Prochain tournoi en mémoire (mis à jour par !tournoidate)
+bot.interactions = InteractionDispatcher(bot)  # 🧭 Réactions routées par id de message
+bot.outbound = OutboundScheduler()             # 📤 Envois par salon, éditions fusionnées
+bot.art_cache = ArtCache()                     # 🖼️ Illustrations transformées (modes de !illustration)
 
 # ──────────────────────────────────────────────────────────────
 # 🔌 Chargement dynamique des commandes depuis /commands/*
@@ -77,6 +99,28 @@ async def load_commands():
                     except Exception as e:
                         print(f"❌ Failed to load {path}: {e}")
 
+# ──────────────────────────────────────────────────────────────
+# 🔁 Chargement des tâches planifiées depuis /tasks/*
+# ──────────────────────────────────────────────────────────────
+async def load_tasks():
+    for filename in os.listdir("tasks"):
+        if filename.endswith(".py"):
+            path = f"tasks.{filename[:-3]}"
+            try:
+                await bot.load_extension(path)
+                print(f"✅ Loaded {path}")
+            except Exception as e:
+                print(f"❌ Failed to load {path}: {e}")
+
+# ──────────────────────────────────────────────────────────────
+# 🪝 Setup hook : extensions chargées pendant login(), une fois le client
+#    initialisé (les cog_load peuvent lancer des tâches qui attendent on_ready)
+# ──────────────────────────────────────────────────────────────
+@bot.event
+async def setup_hook():
+    await load_commands()
+    await load_tasks()
+
 # ──────────────────────────────────────────────────────────────
 # 🔔 On Ready : présence + verrouillage forcé de l’instance
 # ──────────────────────────────────────────────────────────────
@@ -85,34 +129,17 @@ async def on_ready():
     print(f"✅ Connecté en tant que {bot.user.name}")
     await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.playing, name="Duel Monsters"))
 
-    try:
-        # Forcer le verrou avec la nouvelle instance à chaque redémarrage
-        now = datetime.now(timezone.utc).isoformat()
-        supabase.table("bot_lock").upsert({
-            "id": "bot_lock",
-            "instance_id": INSTANCE_ID,
-            "updated_at": now
-        }).execute()
-
-        print(f"🔐 Verrou mis à jour pour cette instance : {INSTANCE_ID}")
-        bot.is_main_instance = True
-
-    except Exception as e:
-        print(f"❌ Erreur lors de la mise à jour du verrou : {e}")
-        bot.is_main_instance = False
+    # Forcer le verrou avec la nouvelle instance au premier on_ready, puis le renouveler
+    # (les reconnexions suivantes ne le reprennent pas de force)
+    bot.instance_lease.start()
 
 # ──────────────────────────────────────────────────────────────
 # 📩 Message reçu : réagir aux mots-clés et lancer les commandes
 # ──────────────────────────────────────────────────────────────
 @bot.event
 async def on_message(message):
-    try:
-        lock = supabase.table("bot_lock").select("instance_id").eq("id", "bot_lock").execute()
-        if lock.data and isinstance(lock.data, list):
-            if lock.data and lock.data[0].get("instance_id") != INSTANCE_ID:
-                return
-    except Exception as e:
-        print(f"❌ Erreur lors de la vérification du lock : {e}")
+    # 🔐 Seule l’instance principale répond (état tenu en mémoire par le bail)
+    if not bot.is_main_instance:
         return
 
     if message.author.bot:
@@ -172,7 +199,22 @@ if __name__ == "__main__":
     keep_alive()
 
     async def start():
-        await load_commands()
-        await bot.start(TOKEN)
+        # 🌐 Une seule session HTTP pour tout le bot, fermée automatiquement à l’arrêt
+        async with create_http_session() as session:
+            bot.http_session = session
+            bot.card_catalog.start(session)
+            bot.art_cache.start(session)
+            bot.loop_watchdog.start(bot)
+            bot.streak_buffer.start()
+            bot.leaderboard.start(bot.streak_buffer)
+            try:
+                await bot.start(TOKEN)
+            finally:
+                bot.leaderboard.stop()
+                await bot.streak_buffer.close()
+                bot.instance_lease.stop()
+                bot.loop_watchdog.stop()
+                bot.card_catalog.stop()
+                bot.art_cache.stop()
 
     asyncio.run(start())
@@ -32,7 +32,31 @@ class Ping(commands.Cog):
         """Commande simple pour tester la réactivité du bot."""
         try:
             latence = round(self.bot.latency * 1000)
-            await ctx.send(f"🏓 Pong ! Latence : {latence} ms")
+            message = f"🏓 Pong ! Latence : {latence} ms"
+
+            # 🐕 Compteurs du chien de garde de la boucle asyncio
+            watchdog = getattr(self.bot, "loop_watchdog", None)
+            if watchdog:
+                stats = watchdog.stats()
+                message += (
+                    f"\n🔁 Boucle : retard actuel {stats['last_lag_ms']} ms, max {stats['max_lag_ms']} ms, "
+                    f"{stats['stalls']} blocage(s) détecté(s)"
+                )
+                if stats["top_blame"]:
+                    blame, count = stats["top_blame"][0]
+                    message += f"\n🎯 Principal responsable : `{blame}` ({count}×)"
+
+            # 📤 Envois vers Discord (éditions fusionnées, salons saturés)
+            outbound = getattr(self.bot, "outbound", None)
+            if outbound:
+                stats = outbound.summary()
+                message += (
+                    f"\n📤 Envois : {stats['sent']} appel(s), {stats['coalesced']} édition(s) fusionnée(s), "
+                    f"{stats['pending']} en attente, "
+                    f"{len(stats['saturated'])} salon(s) saturé(s)"
+                )
+
+            await ctx.send(message)
         except Exception as e:
             print("[ERREUR ping]", e)
             await ctx.send("❌ Une erreur est survenue lors de l'exécution de la commande.")
@@ -10,7 +10,6 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import discord
 from discord.ext import commands
-import requests
 import random
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -25,8 +24,8 @@ class DeckMaudit(commands.Cog):
         self.bot = bot
 
     def est_maudite(self, carte):
-        nom = carte.get("name", "").lower()
-        desc = carte.get("desc", "").lower()
+        nom = (carte.name or "").lower()
+        desc = (carte.desc or "").lower()
 
         absurdité = any(m in desc for m in [
             "lancez un dé", "pile ou face", "perdez", "infligez", "sacrifiez", "détruisez", "piochez"
@@ -34,9 +33,8 @@ class DeckMaudit(commands.Cog):
         drole = any(m in nom for m in [
             "crapaud", "bataille", "magicien fou", "panda", "boulet", "peste", "poubelle", "chat", "bacon", "grenouille"
         ])
-        ancien = carte.get("id", 99999999) < 10000000
-        commun = all(set_code.get("rarity", "") in ["Common", ""] for set_code in carte.get("card_sets", []) or [])
-        return (absurdité or drole) and ancien and commun
+        ancien = (carte.id or 99999999) < 10000000
+        return (absurdité or drole) and ancien and carte.only_common and carte.tcg
 
     @commands.command(
         name="DeckMaudit",
@@ -49,9 +47,10 @@ class DeckMaudit(commands.Cog):
         await ctx.typing()
 
         try:
-            response = requests.get("https://db.ygoprodeck.com/api/v7/cardinfo.php?format=tcg&language=fr")
-            response.raise_for_status()
-            cartes = response.json().get("data", [])
+            cartes = await self.bot.card_catalog.get_cards()
+            if not cartes:
+                await ctx.send("❌ Impossible de récupérer les cartes depuis l’API.")
+                return
 
             main_deck = []
             extra_deck = []
@@ -59,7 +58,7 @@ class DeckMaudit(commands.Cog):
             for carte in cartes:
                 if not self.est_maudite(carte):
                     continue
-                if carte.get("type") in ["Fusion Monster", "Synchro Monster", "Xyz Monster", "Link Monster"]:
+                if carte.type in ["Fusion Monster", "Synchro Monster", "Xyz Monster", "Link Monster"]:
                     extra_deck.append(carte)
                 else:
                     main_deck.append(carte)
@@ -78,12 +77,12 @@ class DeckMaudit(commands.Cog):
             )
             embed.add_field(
                 name=f"🃏 Main Deck ({len(deck_final)} cartes)",
-                value="\n".join(f"• {c['name']}" for c in deck_final) if deck_final else "Aucune carte absurde trouvée pour le Main Deck.",
+                value="\n".join(f"• {c.name}" for c in deck_final) if deck_final else "Aucune carte absurde trouvée pour le Main Deck.",
                 inline=False
             )
             embed.add_field(
                 name=f"💀 Extra Deck ({len(extra_final)} cartes)",
-                value="\n".join(f"• {c['name']}" for c in extra_final) if extra_final else "Aucune carte absurde trouvée pour l'Extra Deck.",
+                value="\n".join(f"• {c.name}" for c in extra_final) if extra_final else "Aucune carte absurde trouvée pour l'Extra Deck.",
                 inline=False
             )
             embed.set_footer(text="Deck totalement injouable. À ne pas utiliser sérieusement 😈")
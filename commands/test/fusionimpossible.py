@@ -11,7 +11,7 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Button
-import requests
+import random
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔧 Fonctions utilitaires
@@ -47,22 +47,22 @@ class FusionImpossibleView(View):
         await interaction.response.defer()
 
         try:
-            url = "https://db.ygoprodeck.com/api/v7/randomcard.php?language=fr"
-            self.carte1 = requests.get(url).json()
-            self.carte2 = requests.get(url).json()
+            # 📚 Tirage dans le catalogue partagé : aucune requête réseau bloquante
+            cartes = await self.bot.card_catalog.get_cards()
+            self.carte1, self.carte2 = random.sample(cartes, 2)
 
-            nom_fusion = generer_nom(self.carte1["name"], self.carte2["name"])
-            type_fusion = fusionner_types(self.carte1.get("type"), self.carte2.get("type"))
-            effet_fusion = fusionner_effets(self.carte1.get("desc"), self.carte2.get("desc"))
+            nom_fusion = generer_nom(self.carte1.name, self.carte2.name)
+            type_fusion = fusionner_types(self.carte1.type, self.carte2.type)
+            effet_fusion = fusionner_effets(self.carte1.desc, self.carte2.desc)
 
             embed = discord.Embed(
                 title=f"🧪 Fusion Impossible : {nom_fusion}",
                 description=f"**Type :** {type_fusion}\n\n**Effet combiné :**\n{effet_fusion}",
                 color=discord.Color.purple()
             )
-            embed.set_thumbnail(url=self.carte1.get("card_images", [{}])[0].get("image_url", ""))
-            embed.set_image(url=self.carte2.get("card_images", [{}])[0].get("image_url", ""))
-            embed.set_footer(text=f"Fusion de « {self.carte1['name']} » + « {self.carte2['name']} »")
+            embed.set_thumbnail(url=self.carte1.image_url or "")
+            embed.set_image(url=self.carte2.image_url or "")
+            embed.set_footer(text=f"Fusion de « {self.carte1.name} » + « {self.carte2.name} »")
 
             await interaction.edit_original_response(embed=embed, content=None, view=None)
 
@@ -13,7 +13,7 @@ from discord.ext import commands
 import json
 import os
 import random
-import asyncio
+from utils.answer_view import AnswerView  # 🎛️ Boutons de réponse
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Chargement des données JSON
@@ -57,30 +57,21 @@ class Quizz(commands.Cog):
 
             embed = discord.Embed(
                 title="🃏 Quiz Yu-Gi-Oh! 🃏",
-                description=f"**{question}**\n\n{desc}\n*Réponds en cliquant sur l'emoji correspondant.*",
+                description=f"**{question}**\n\n{desc}\n*Réponds en cliquant sur le bouton correspondant.*",
                 color=discord.Color.blue()
             )
 
-            quiz_message = await ctx.send(embed=embed)
+            # Boutons de réponse envoyés avec la question ; seul l'auteur peut répondre
+            view = AnswerView(emojis[:len(choices)], timeout=30.0, user_id=ctx.author.id)
+            quiz_message = await ctx.send(embed=embed, view=view)
 
-            # Ajouter réactions
-            for emoji in emojis:
-                await quiz_message.add_reaction(emoji)
-
-            def check(reaction, user):
-                return (
-                    user == ctx.author
-                    and str(reaction.emoji) in emojis
-                    and reaction.message.id == quiz_message.id
-                )
-
-            try:
-                reaction, user = await self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            except asyncio.TimeoutError:
+            await view.wait()
+            await quiz_message.edit(view=view.reveal(correct_index))
+            if ctx.author.id not in view.answers:
                 await ctx.send(f"⏰ Temps écoulé, {ctx.author.mention} ! Tu n'as pas répondu à temps.")
                 return
 
-            user_answer = emojis.index(str(reaction.emoji))
+            user_answer = view.answers[ctx.author.id]
 
             if user_answer == correct_index:
                 await ctx.send(f"✅ Bravo {ctx.author.mention}, bonne réponse !")
@@ -1,18 +1,23 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Button
-import requests
+import random
 
 class TestView(View):
+    def __init__(self, bot):
+        super().__init__()
+        self.bot = bot
+
     @discord.ui.button(label="Carte aléatoire", style=discord.ButtonStyle.primary)
     async def button_callback(self, interaction: discord.Interaction, button: Button):
         await interaction.response.defer()
         try:
-            r = requests.get("https://db.ygoprodeck.com/api/v7/randomcard.php?language=fr")
-            data = r.json()
-            name = data.get("name", "Inconnu")
-            desc = data.get("desc", "Pas d'effet")
-            img_url = data.get("card_images", [{}])[0].get("image_url", "")
+            # Tirage dans le catalogue partagé : aucune requête réseau bloquante
+            cartes = await self.bot.card_catalog.get_cards()
+            data = random.choice(cartes)
+            name = data.name or "Inconnu"
+            desc = data.desc or "Pas d'effet"
+            img_url = data.image_url or ""
 
             embed = discord.Embed(title=name, description=desc, color=discord.Color.blue())
             if img_url:
@@ -28,7 +33,7 @@ class TestCog(commands.Cog):
 
     @commands.slash_command(name="testfusion", description="Test bouton carte aléatoire")
     async def testfusion(self, ctx: discord.ApplicationContext):
-        view = TestView()
+        view = TestView(self.bot)
         await ctx.respond("Clique pour une carte aléatoire", view=view)
 
 async def setup(bot):
@@ -10,10 +10,12 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import discord
 from discord.ext import commands
-import aiohttp
 import os
+import json
+import time
 from datetime import datetime
 import locale
+from utils.database import db  # ☁️ Accès asynchrone à Supabase (inscriptions aux rappels)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🌍 Configuration régionale
@@ -27,10 +29,8 @@ except locale.Error:
         pass  # fallback manuel plus bas
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🔐 Configuration Supabase
+# 🔐 Configuration
 # ────────────────────────────────────────────────────────────────────────────────
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SHEET_CSV_URL = os.getenv("SHEET_CSV_URL2")
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -38,6 +38,40 @@ SHEET_CSV_URL = os.getenv("SHEET_CSV_URL2")
 # ────────────────────────────────────────────────────────────────────────────────
 EMOJI_RAPPEL = "🛎️"
 
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 Messages !tournoi suivis
+# ────────────────────────────────────────────────────────────────────────────────
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TRACKED_PATH = os.path.join(ROOT_DIR, "data", "cache", "tournoi_messages.json")
+TRACKED_TTL = 60 * 24 * 60 * 60  # ⏳ Réactions acceptées pendant 60 jours
+MAX_TRACKED = 200                # 🧹 Messages suivis au plus
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖼️ Embed du prochain tournoi
+# ────────────────────────────────────────────────────────────────────────────────
+def build_embed(info: dict) -> discord.Embed:
+    # ─── Formatage de la date ────────────────────────────────────────────────
+    iso_date = info["prochaine_date"]
+    try:
+        dt_obj = datetime.fromisoformat(iso_date)
+        date_formatee = dt_obj.strftime('%d %B %Y à %Hh%M')
+    except Exception:
+        date_formatee = iso_date  # fallback brut si parsing échoue
+
+    # ─── Construction de l'embed ─────────────────────────────────────────────
+    embed = discord.Embed(
+        title="📅 Prochain tournoi",
+        description=(
+            f"📆 **Date du prochain tournoi VAACT** :\n"
+            f"➡️ **{date_formatee}**\n\n"
+            f"📋 **Decks libres et pris** :\n"
+            f"[Clique ici pour voir la liste]({SHEET_CSV_URL})"
+        ),
+        color=discord.Color.gold()
+    )
+    embed.set_footer(text=f"Réagis à ce message avec {EMOJI_RAPPEL} pour recevoir un rappel 3 jours, 1 jour et 1 heure avant.")
+    return embed
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
 # ────────────────────────────────────────────────────────────────────────────────
@@ -49,6 +83,7 @@ class TournoiCommand(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.tracked = self.load_tracked()  # 📌 message_id -> horodatage d'envoi
 
     @commands.command(
         name="tournoi",
@@ -57,102 +92,92 @@ class TournoiCommand(commands.Cog):
     )
     async def tournoi(self, ctx: commands.Context):
         """Commande principale !tournoi."""
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            await ctx.send("❌ Configuration manquante (SUPABASE_URL ou SUPABASE_KEY).")
-            return
-
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}"
-        }
-
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{SUPABASE_URL}/rest/v1/tournoi_info?select=prochaine_date&order=id.desc&limit=1"
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        await ctx.send("❌ Erreur lors de la récupération des données Supabase.")
-                        return
-                    data = await response.json()
+            info = await self.bot.tournoi_info.get()  # 📅 En mémoire (voir utils/tournoi_info.py)
         except Exception as e:
             print(f"[ERREUR tournoi] {e}")
             await ctx.send("❌ Erreur de connexion à Supabase.")
             return
 
-        if not data or not data[0].get("prochaine_date"):
+        if not info or not info.get("prochaine_date"):
             await ctx.send("📭 Aucun tournoi prévu pour le moment.")
             return
 
-        # ─── Formatage de la date ────────────────────────────────────────────────
-        iso_date = data[0]["prochaine_date"]
+        embed = self.bot.tournoi_info.rendered(build_embed)  # 🖼️ Reconstruit seulement après un changement de date
+        message = await ctx.send(embed=embed)
+        await message.add_reaction(EMOJI_RAPPEL)
+        self.track(message.id)  # 🛎️ Les inscriptions passent par bot.interactions
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📌 Messages !tournoi suivis (persistés pour survivre aux redémarrages)
+    # ────────────────────────────────────────────────────────────────────────────
+    def load_tracked(self) -> dict:
         try:
-            dt_obj = datetime.fromisoformat(iso_date)
-            date_formatee = dt_obj.strftime('%d %B %Y à %Hh%M')
-        except Exception:
-            date_formatee = iso_date  # fallback brut si parsing échoue
-
-        # ─── Construction de l'embed ─────────────────────────────────────────────
-        embed = discord.Embed(
-            title="📅 Prochain tournoi",
-            description=(
-                f"📆 **Date du prochain tournoi VAACT** :\n"
-                f"➡️ **{date_formatee}**\n\n"
-                f"📋 **Decks libres et pris** :\n"
-                f"[Clique ici pour voir la liste]({SHEET_CSV_URL})"
-            ),
-            color=discord.Color.gold()
+            with open(TRACKED_PATH, encoding="utf-8") as f:
+                return {int(mid): posted_at for mid, posted_at in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[ERREUR TOURNOI] Messages suivis illisibles : {e}")
+            return {}
+
+    def track(self, message_id: int):
+        now = time.time()
+        self.tracked[message_id] = now
+        # 🧹 On ne garde que les messages récents, au plus MAX_TRACKED
+        recent = sorted(
+            ((mid, posted_at) for mid, posted_at in self.tracked.items() if now - posted_at < TRACKED_TTL),
+            key=lambda item: item[1],
         )
-        embed.set_footer(text=f"Réagis à ce message avec {EMOJI_RAPPEL} pour recevoir un rappel 3 jours avant.")
+        kept = dict(recent[-MAX_TRACKED:])
+        for mid in self.tracked.keys() - kept.keys():
+            self.bot.interactions.discard(mid)
+        self.tracked = kept
+        self.bot.interactions.add(message_id, self.on_rappel_reaction, emojis=[EMOJI_RAPPEL])
+        try:
+            os.makedirs(os.path.dirname(TRACKED_PATH), exist_ok=True)
+            tmp_path = TRACKED_PATH + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.tracked, f)
+            os.replace(tmp_path, TRACKED_PATH)
+        except Exception as e:
+            print(f"[ERREUR TOURNOI] Sauvegarde des messages suivis : {e}")
 
-        message = await ctx.send(embed=embed)
-        await message.add_reaction(EMOJI_RAPPEL)
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🛎️ Inscription au rappel par réaction
+    # ────────────────────────────────────────────────────────────────────────────
+    async def on_rappel_reaction(self, payload: discord.RawReactionActionEvent):
+        if not self.bot.is_main_instance:
+            return  # 🔐 Seule l'instance principale inscrit (sinon MP en double)
 
-        def check(reaction, user):
-            return (
-                reaction.message.id == message.id
-                and str(reaction.emoji) == EMOJI_RAPPEL
-                and not user.bot
-            )
-
-        # ─── Attente de réactions pendant 15 minutes ─────────────────────────────
-        while True:
-            try:
-                reaction, user = await self.bot.wait_for("reaction_add", timeout=900.0, check=check)
-
-                async with aiohttp.ClientSession() as session:
-                    # Vérifie si l’utilisateur est déjà inscrit
-                    url = f"{SUPABASE_URL}/rest/v1/rappels_tournoi?user_id=eq.{user.id}"
-                    headers["Prefer"] = "resolution=merge-duplicates"
-                    async with session.get(url, headers=headers) as r:
-                        exists = await r.json()
-
-                    if exists:
-                        try:
-                            await user.send("🛎️ Tu es déjà inscrit pour recevoir un rappel 3 jours avant le tournoi !")
-                        except discord.Forbidden:
-                            await ctx.send(f"{user.mention}, je ne peux pas t’envoyer de message privé. Active-les.")
-                        continue
-
-                    # Sinon, inscription de l’utilisateur
-                    async with session.post(
-                        f"{SUPABASE_URL}/rest/v1/rappels_tournoi",
-                        headers={**headers, "Content-Type": "application/json"},
-                        json={"user_id": str(user.id)}
-                    ) as insert_resp:
-                        if insert_resp.status in [200, 201]:
-                            try:
-                                await user.send("✅ Tu recevras un rappel 3 jours avant le tournoi !")
-                            except discord.Forbidden:
-                                await ctx.send(f"{user.mention}, je ne peux pas t’envoyer de message privé. Active-les.")
-                        else:
-                            print("[SUPABASE INSERT ERROR]", await insert_resp.text())
-
-            except Exception as e:
-                print("[REACTION TIMEOUT OU ERREUR]", e)
-                break
+        try:
+            created = await db.add_rappel(payload.user_id)
+        except Exception as e:
+            print("[SUPABASE INSERT ERROR]", e)
+            return
+
+        user = payload.member or (await self.bot.user_cache.fetch_many([payload.user_id]))[payload.user_id]
+        if user is None or user.bot:
+            return
+        try:
+            if created:
+                await user.send("✅ Tu recevras un rappel 3 jours, 1 jour et 1 heure avant le tournoi !")
+            else:
+                await user.send("🛎️ Tu es déjà inscrit pour recevoir les rappels du tournoi !")
+        except discord.Forbidden:
+            channel = self.bot.get_channel(payload.channel_id)
+            if channel:
+                await channel.send(f"{user.mention}, je ne peux pas t’envoyer de message privé. Active-les.")
 
     def cog_load(self):
         self.tournoi.category = "VAACT"
+        # 📌 Réactions routées par id de message, sans délai d'expiration
+        for message_id in self.tracked:
+            self.bot.interactions.add(message_id, self.on_rappel_reaction, emojis=[EMOJI_RAPPEL])
+
+    def cog_unload(self):
+        for message_id in self.tracked:
+            self.bot.interactions.discard(message_id)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
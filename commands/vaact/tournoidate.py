@@ -12,15 +12,6 @@ import discord
 from discord.ext import commands
 from discord.ui import View, Select
 from datetime import datetime
-import os
-from supabase import create_client, Client  # pip install supabase
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 📂 Configuration Supabase
-# ────────────────────────────────────────────────────────────────────────────────
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Vue interactive pour sélectionner la date
@@ -150,15 +141,19 @@ class DateSelectView(View):
             return
 
         try:
-            response = supabase.table("tournoi_info").update({"prochaine_date": dt.isoformat()}).eq("id", 1).execute()
-            if response.get("status_code") in (200, 204):
+            rows = await interaction.client.tournoi_info.set_date(dt.isoformat())
+            if rows:
                 await interaction.response.edit_message(
                     content=f"✅ Date du tournoi mise à jour avec succès : {dt.strftime('%d/%m/%Y %Hh')}",
                     view=None
                 )
+                # ⏰ Replanifie les rappels pour la nouvelle date
+                rappel_task = interaction.client.get_cog("TournoiRappelTask")
+                if rappel_task:
+                    rappel_task.wake()
             else:
                 await interaction.response.edit_message(
-                    content=f"❌ Erreur lors de la mise à jour en base (code {response.get('status_code')})",
+                    content="❌ Erreur lors de la mise à jour en base (aucune ligne tournoi_info modifiée)",
                     view=self
                 )
         except Exception as e:
@@ -1,8 +1,8 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📁 banlist.py — Commande !banlist
 # ────────────────────────────────────────────────────────────────────────────────
-# Ce module permet de récupérer et afficher la banlist TCG actuelle
-# depuis l’API YGOPRODeck : cartes bannies, limitées, semi-limités.
+# Ce module permet d’afficher la banlist TCG actuelle à partir du
+# catalogue de cartes partagé : cartes bannies, limitées, semi-limités.
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -10,7 +10,6 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import discord                            # 📦 API Discord
 from discord.ext import commands          # 🧩 Gestion des commandes
-import aiohttp                            # 🌐 Requêtes HTTP asynchrones
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔧 COG : BanlistCommand
@@ -18,7 +17,7 @@ import aiohttp                            # 🌐 Requêtes HTTP asynchrones
 class BanlistCommand(commands.Cog):
     """
     📋 Commande permettant d’afficher la banlist TCG actuelle de Yu-Gi-Oh!.
-    Données récupérées dynamiquement depuis l’API YGOPRODeck.
+    Données lues dans le catalogue partagé (bot.card_catalog, source YGOPRODeck).
     """
 
     def __init__(self, bot: commands.Bot):
@@ -35,20 +34,16 @@ class BanlistCommand(commands.Cog):
     @commands.cooldown(rate=1, per=5, type=commands.BucketType.user)  # 🧊 Anti-spam utilisateur
     async def banlist(self, ctx: commands.Context):
         """
-        🔍 Récupère les cartes bannies, limitées et semi-limitées via API
+        🔍 Trie les cartes bannies, limitées et semi-limitées du catalogue
         et affiche le tout dans un embed Discord.
         """
 
-        url = "https://db.ygoprodeck.com/api/v7/cardinfo.php?banlist=tcg"  # 🌐 URL API
-
         try:
-            # 🌍 Requête asynchrone vers l’API
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        await ctx.send("🚨 Impossible de récupérer la banlist.")
-                        return
-                    data = await resp.json()
+            # 📚 Lecture du catalogue partagé (aucune requête HTTP par commande)
+            cards = await self.bot.card_catalog.get_cards()
+            if not cards:
+                await ctx.send("🚨 Impossible de récupérer la banlist.")
+                return
 
             # 📦 Initialisation des catégories
             banned = []        # ❌ Cartes interdites
@@ -56,9 +51,9 @@ class BanlistCommand(commands.Cog):
             semi_limited = []  # ⚖️ Cartes semi-limités (2 copies max)
 
             # 🔍 Analyse des cartes reçues
-            for card in data.get("data", []):
-                name = card.get("name", "Carte inconnue")
-                ban_status = card.get("banlist_info", {}).get("ban_tcg", None)
+            for card in cards:
+                name = card.name or "Carte inconnue"
+                ban_status = card.ban_tcg
 
                 # 📤 Tri selon le statut
                 if ban_status == "Banned":
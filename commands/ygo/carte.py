@@ -10,8 +10,20 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import discord
 from discord.ext import commands
-import aiohttp
+import asyncio
+import time
 import urllib.parse
+from utils.card_store import Card, display
+from utils.card_search import normalize
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+CARDINFO_URL = "https://db.ygoprodeck.com/api/v7/cardinfo.php"
+LANG_CODES = ["fr", "en", "de", "it", "pt"]
+FUZZY_THRESHOLD = 0.85  # 🎯 Score minimal pour accepter directement une correspondance approchée
+MISS_TTL = 10 * 60      # 🚫 Durée de mémorisation d’un nom introuvable
+MISS_CACHE_SIZE = 1000  # 🚫 Nombre maximal de noms introuvables mémorisés
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -19,10 +31,85 @@ import urllib.parse
 class Carte(commands.Cog):
     """
     Commande !carte — Rechercher une carte Yu-Gi-Oh! et afficher ses informations.
+    Les noms sont résolus via l’index local du catalogue (toutes langues, fautes tolérées) ;
+    l’API n’est interrogée qu’en dernier recours.
     """
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.misses = {}  # 🚫 nom normalisé -> expiration (cache négatif des recherches API)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🚫 Cache négatif
+    # ────────────────────────────────────────────────────────────────────────────
+    def is_known_miss(self, nom: str) -> bool:
+        key = normalize(nom)
+        expires = self.misses.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self.misses[key]
+            return False
+        return True
+
+    def remember_miss(self, nom: str):
+        now = time.monotonic()
+        if len(self.misses) >= MISS_CACHE_SIZE:
+            self.misses = {k: v for k, v in self.misses.items() if v > now}
+            while len(self.misses) >= MISS_CACHE_SIZE:
+                del self.misses[next(iter(self.misses))]  # ⏳ Le plus ancien en premier
+        self.misses[normalize(nom)] = now + MISS_TTL
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🌐 Accès API (cartes absentes du catalogue local)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def fetch_card(self, session, query: str, code: str):
+        """Retourne la carte correspondant à `query` (ex. name=… ou id=…) dans la langue `code`, ou None."""
+        url = f"{CARDINFO_URL}?{query}&language={code}"
+        async with session.get(url) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                if "data" in data:
+                    return Card.from_api(data["data"][0])
+                return None
+            elif resp.status == 400:
+                # Carte non trouvée dans cette langue
+                return None
+            raise RuntimeError(f"Réponse HTTP {resp.status}")
+
+    async def search_api(self, nom: str):
+        """
+        Recherche exacte du nom dans toutes les langues en parallèle, via l’API.
+        La première langue qui trouve la carte l’emporte, les autres requêtes sont annulées.
+        Retourne (carte, langue) ou (None, None).
+        """
+        nom_encode = urllib.parse.quote(nom)
+        session = self.bot.http_session
+        tasks = {
+            asyncio.create_task(self.fetch_card(session, f"name={nom_encode}", code)): code
+            for code in LANG_CODES
+        }
+        pending = set(tasks)
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        error = task.exception()
+                    elif task.result():
+                        return task.result(), tasks[task]
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if error:
+            raise error
+        return None, None
+
+    async def fetch_by_id(self, card_id, code: str):
+        """Récupère une carte connue de l’index mais absente du catalogue français."""
+        return await self.fetch_card(self.bot.http_session, f"id={card_id}", code)
 
     @commands.command(
         name="carte",
@@ -33,65 +120,76 @@ class Carte(commands.Cog):
     async def carte(self, ctx: commands.Context, *, nom: str):
         """Commande principale pour chercher une carte Yu-Gi-Oh!"""
 
-        lang_codes = ["fr", "en", "de", "it", "pt"]
-        nom_encode = urllib.parse.quote(nom)
-
+        catalog = self.bot.card_catalog
         carte = None
-        langue_detectee = "?"
+        langue_detectee = "?"   # 🌍 Langue dans laquelle le nom a été reconnu
+        langue_affichee = "?"   # 📖 Langue des données affichées
         nom_corrige = nom
 
+        # ─── 🔍 Résolution locale : exacte, puis approchée ───────────────────────
+        match = catalog.name_index.lookup(nom)
+        suggestions = []
+        if not match:
+            suggestions = catalog.name_index.search(nom)
+            if suggestions and suggestions[0].score >= FUZZY_THRESHOLD:
+                match = suggestions[0]
+
         try:
-            async with aiohttp.ClientSession() as session:
-                for code in lang_codes:
-                    url = f"https://db.ygoprodeck.com/api/v7/cardinfo.php?name={nom_encode}&language={code}"
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            if "data" in data:
-                                carte = data["data"][0]
-                                langue_detectee = code
-                                nom_corrige = carte.get("name", nom)
-                                break
-                        elif resp.status == 400:
-                            # Carte non trouvée dans cette langue, on continue
-                            continue
-                        else:
-                            # Autre erreur API
-                            await ctx.send("🚨 Erreur : Impossible de récupérer les données depuis l’API.")
-                            return
+            if match:
+                langue_detectee = match.lang
+                nom_corrige = match.name
+                carte = catalog.store.get(match.card_id)
+                langue_affichee = catalog.language
+                if not carte:
+                    carte = await self.fetch_by_id(match.card_id, match.lang)
+                    langue_affichee = match.lang
+
+            # ─── 🌐 Dernier recours : recherche exacte via l’API ─────────────────
+            if not carte and not self.is_known_miss(nom):
+                carte, code = await self.search_api(nom)
+                if carte:
+                    langue_detectee = langue_affichee = code
+                    nom_corrige = carte.name or nom
+                else:
+                    self.remember_miss(nom)
         except Exception as e:
             print(f"[ERREUR commande !carte] {e}")
-            await ctx.send("🚨 Erreur inattendue lors de la récupération des données.")
+            await ctx.send("🚨 Erreur : Impossible de récupérer les données depuis l’API.")
             return
 
         if not carte:
-            await ctx.send(f"❌ Carte introuvable dans toutes les langues. Vérifie l’orthographe exacte : `{nom}`.")
+            message = f"❌ Carte introuvable dans toutes les langues. Vérifie l’orthographe exacte : `{nom}`."
+            if suggestions:
+                message += "\n💡 Tu voulais peut-être dire :\n" + "\n".join(
+                    f"• **{s.name}** ({s.lang.upper()})" for s in suggestions
+                )
+            await ctx.send(message)
             return
 
         if nom_corrige.lower() != nom.lower():
             await ctx.send(f"🔍 Résultat trouvé pour **{nom_corrige}** ({langue_detectee.upper()})")
 
         embed = discord.Embed(
-            title=f"{carte.get('name', 'Carte inconnue')} ({langue_detectee.upper()})",
-            description=carte.get("desc", "Pas de description disponible."),
+            title=f"{carte.name or 'Carte inconnue'} ({langue_affichee.upper()})",
+            description=carte.desc or "Pas de description disponible.",
             color=discord.Color.red()
         )
 
-        embed.add_field(name="🧪 Type", value=carte.get("type", "?"), inline=True)
+        embed.add_field(name="🧪 Type", value=display(carte.type, "?"), inline=True)
 
-        if carte.get("type", "").lower().startswith("monstre"):
-            atk = carte.get("atk", "?")
-            defe = carte.get("def", "?")
-            level = carte.get("level", "?")
-            attr = carte.get("attribute", "?")
-            race = carte.get("race", "?")
+        if carte.is_monster:
+            atk = display(carte.atk, "?")
+            defe = display(carte.defense, "?")
+            level = display(carte.level, "?")
+            attr = display(carte.attribute, "?")
+            race = display(carte.race, "?")
 
             embed.add_field(name="⚔️ ATK / DEF", value=f"{atk} / {defe}", inline=True)
             embed.add_field(name="⭐ Niveau / Rang", value=str(level), inline=True)
             embed.add_field(name="🌪️ Attribut", value=attr, inline=True)
             embed.add_field(name="👹 Race", value=race, inline=True)
 
-        embed.set_thumbnail(url=carte["card_images"][0]["image_url"])
+        embed.set_thumbnail(url=carte.image_url)
         await ctx.send(embed=embed)
 
     def cog_load(self):
@@ -9,17 +9,26 @@
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
 import discord
+import io
 from discord.ext import commands
-import aiohttp
 import random
 import asyncio
-from supabase_client import supabase
 import traceback
+from collections import namedtuple
+from utils.answer_view import AnswerView  # 🎛️ Boutons de réponse
+from utils.round_pool import RoundPool    # 📦 Manches préparées en tâche de fond
+from utils.outbound import ANSWER        # 📤 Priorité des éditions (bot.outbound)
+from utils.art_cache import MODES        # 🎚️ Modes de difficulté (bot.art_cache)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔤 CONSTANTES
 # ────────────────────────────────────────────────────────────────────────────────
 REACTIONS = ["🇦", "🇧", "🇨", "🇩"]
+ART_FILENAME = "illustration.jpg"   # 🖼️ Pièce jointe des modes de difficulté
+ROUND_SECONDS = 10                  # ⏳ Durée d'une manche
+
+# Manche prête : carte à deviner, propositions, index de la bonne réponse, embed
+IllustrationRound = namedtuple("IllustrationRound", ["card", "choices", "correct_index", "embed"])
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal — IllustrationCommand
@@ -31,158 +40,149 @@ class IllustrationCommand(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # 📦 Manches prêtes à l'avance, images des modes de difficulté déjà rendues
+        self.pool = RoundPool(bot, self.build_round, prepare=lambda r: bot.art_cache.prerender(r.card))
 
-    async def fetch_all_cards(self):
-        url = "https://db.ygoprodeck.com/api/v7/cardinfo.php?language=fr"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return []
-                data = await resp.json()
-        return data.get("data", [])
-
-    async def get_similar_cards(self, all_cards, true_card):
-        archetype = true_card.get("archetype")
-        card_type = true_card.get("type", "")
-
-        if archetype:
-            group = [
-                c for c in all_cards
-                if c.get("archetype") == archetype and c["name"] != true_card["name"]
-            ]
+    async def cog_load(self):
+        self.pool.start()
+
+    def cog_unload(self):
+        self.pool.stop()
 
+    def get_similar_cards(self, store, true_card):
+        """Trois leurres : même archétype, ou même type sans archétype (index du catalogue)."""
+        if true_card.archetype:
+            group = store.by_archetype.get(true_card.archetype, [])
         else:
-            group = [
-                c for c in all_cards
-                if c.get("type") == card_type
-                and not c.get("archetype")  # carte sans archétype
-                and c["name"] != true_card["name"]
-            ]
-            
+            group = store.by_type_no_archetype.get(true_card.type, [])
+        return store.sample_distractors(group, true_card, 3)
+
+    def build_round(self, store):
+        """Manche prête (tâche de fond, voir utils/round_pool.py) ; None si la carte tirée ne convient pas."""
+        candidates = store.with_cropped
+        if not candidates:
+            return None
+
+        true_card = random.choice(candidates)
+        image_url = true_card.image_url_cropped
+        if not image_url:
+            return None
+
+        similar_cards = self.get_similar_cards(store, true_card)
+        if len(similar_cards) < 3:
+            return None  # ❌ Pas assez de cartes similaires : nouveau tirage
+
+        all_choices = [true_card.name] + [c.name for c in similar_cards]
+        random.shuffle(all_choices)
+
+        # Préparation de l'embed avec l'image et les choix
+        embed_choices = discord.Embed(
+            title="🖼️ Devine la carte à partir de son illustration ! Tout le monde peut jouer.",
+            description="\n".join(f"{REACTIONS[i]} {name}" for i, name in enumerate(all_choices)),
+            color=discord.Color.purple()
+        )
+        embed_choices.set_image(url=image_url)
+        embed_choices.set_footer(text=f"🔹 Archétype : ||{true_card.archetype or 'Aucun'}||")
+
+        return IllustrationRound(true_card, all_choices, all_choices.index(true_card.name), embed_choices)
+
+    async def get_frames(self, frames_task) -> list:
+        """Images du mode (bytes), ou [] (mode normal ou rendu impossible : image d'origine)."""
+        if frames_task is None:
+            return []
+        try:
+            return await frames_task
+        except Exception as e:
+            print(f"[ERREUR ILLUSTRATION] Rendu de l'image : {e}")
+            return []
 
-        return random.sample(group, k=min(3, len(group))) if group else []
+    async def reveal_frames(self, message, frames: list):
+        """Remplace l'image à intervalles réguliers pendant la manche (éditions cosmétiques)."""
+        step = ROUND_SECONDS / (len(frames) + 1)
+        for data in frames:
+            await asyncio.sleep(step)
+            self.bot.outbound.edit(message, attachments=[discord.File(io.BytesIO(data), filename=ART_FILENAME)])
 
     @commands.command(
         name="illustration",
         aliases=["illu", "i"],
-        help="🖼️ Devine une carte Yu-Gi-Oh! à partir de son illustration.  (multijoueur)",
-        description="Affiche une image de carte Yu-Gi-Oh! croppée et propose un quiz interactif avec réactions. (multijoueur)"
+        help="🖼️ Devine une carte Yu-Gi-Oh! à partir de son illustration.  (multijoueur) Modes : zoom, flou, progressif.",
+        description="Affiche une image de carte Yu-Gi-Oh! croppée et propose un quiz interactif avec boutons. (multijoueur)\n"
+                    "Difficulté optionnelle : `zoom` (fragment agrandi), `flou`, `progressif` (de plus en plus nette)."
     )
     @commands.cooldown(rate=1, per=5, type=commands.BucketType.user)
-    async def illustration(self, ctx: commands.Context):
-        """Commande principale avec quiz d'image et réponses via réactions."""
-        try:
-            all_cards = await self.fetch_all_cards()
-            if not all_cards:
-                await ctx.send("🚨 Impossible de récupérer les cartes depuis l’API.")
-                return
-
-            candidates = [c for c in all_cards if "image_url_cropped" in c.get("card_images", [{}])[0]]
-            if not candidates:
-                await ctx.send("🚫 Pas de cartes avec images croppées.")
-                return
-
-            true_card = random.choice(candidates)
-            image_url = true_card["card_images"][0].get("image_url_cropped")
-            if not image_url:
-                await ctx.send("🚫 Carte sans image croppée.")
-                return
+    async def illustration(self, ctx: commands.Context, mode: str = "normal"):
+        """Commande principale avec quiz d'image et réponses via boutons."""
+        mode = mode.lower()
+        if mode != "normal" and mode not in MODES:
+            await ctx.send(f"❓ Mode inconnu. Modes disponibles : normal, {', '.join(MODES)}.")
+            return
+        if mode != "normal" and not self.bot.art_cache.available:
+            await ctx.send("⚠️ Modes de difficulté indisponibles pour le moment, partie en mode normal.")
+            mode = "normal"
 
-            similar_cards = await self.get_similar_cards(all_cards, true_card)
-            if len(similar_cards) < 3:
-                await ctx.send("❌ Pas assez de cartes similaires.")
+        try:
+            # 📦 Manche préparée à l'avance (carte, propositions, embed)
+            round_ = await self.pool.get()
+            if round_ is None:
+                await ctx.send("🚨 Impossible de préparer une carte (catalogue indisponible ou sans images croppées).")
                 return
+            true_card, all_choices, correct_index, embed_choices = round_
 
-            all_choices = [true_card["name"]] + [c["name"] for c in similar_cards]
-            random.shuffle(all_choices)
-            correct_index = all_choices.index(true_card["name"])
+            # 🖼️ Images du mode (déjà en cache pour les manches de la réserve), pendant le compte à rebours
+            frames_task = None
+            if mode != "normal":
+                frames_task = asyncio.create_task(self.bot.art_cache.frames(true_card, mode))
 
             # Envoi du message de compte à rebours
             countdown_msg = await ctx.send("⏳ Début dans 10 secondes...")
 
-            # Compte à rebours de 10 secondes, on édite le message chaque seconde
-            for i in range(10, 0, -1):
-                await countdown_msg.edit(content=f"⏳ Début dans {i} seconde{'s' if i > 1 else ''}...")
+            # Compte à rebours de 10 secondes : éditions cosmétiques fusionnées par bot.outbound
+            # (si le salon est saturé, les secondes intermédiaires sont sautées)
+            for i in range(9, 0, -1):
                 await asyncio.sleep(1)
-
-            # Préparation de l'embed avec l'image et les choix
-            embed_choices = discord.Embed(
-                title="🖼️ Devine la carte à partir de son illustration ! Tout le monde peut jouer.",
-                description="\n".join(f"{REACTIONS[i]} {name}" for i, name in enumerate(all_choices)),
-                color=discord.Color.purple()
-            )
-            embed_choices.set_image(url=image_url)
-            embed_choices.set_footer(text=f"🔹 Archétype : ||{true_card.get('archetype', 'Aucun')}||")
-
-            # Edition du message initial pour afficher l'embed + description
-            await countdown_msg.edit(content=None, embed=embed_choices)
-
-            # Ajout des réactions pour les réponses
-            for emoji in REACTIONS[:len(all_choices)]:
-                await countdown_msg.add_reaction(emoji)
-
-            def check(reaction, user):
-                return (
-                    reaction.message.id == countdown_msg.id and
-                    str(reaction.emoji) in REACTIONS and
-                    not user.bot
-                )
-
-            users_answers = {}
-
-            try:
-                start = asyncio.get_event_loop().time()
-                while True:
-                    timeout = 10 - (asyncio.get_event_loop().time() - start)
-                    if timeout <= 0:
-                        break
-                    reaction, user = await self.bot.wait_for("reaction_add", timeout=timeout, check=check)
-                    if user.id not in users_answers:
-                        users_answers[user.id] = REACTIONS.index(str(reaction.emoji))
-            except asyncio.TimeoutError:
-                pass
-
+                self.bot.outbound.edit(countdown_msg, content=f"⏳ Début dans {i} seconde{'s' if i > 1 else ''}...")
             await asyncio.sleep(1)
 
-            # Enregistrement des scores dans Supabase
+            frames = await self.get_frames(frames_task)
+            embed = embed_choices
+            extra = {}
+            if frames:
+                embed = embed_choices.copy()
+                embed.title = f"{embed.title} — Mode {mode}"
+                embed.set_image(url=f"attachment://{ART_FILENAME}")
+                extra["attachments"] = [discord.File(io.BytesIO(frames[0]), filename=ART_FILENAME)]
+
+            # Edition du message initial : embed + boutons de réponse en un seul appel
+            # ⏳ 10 secondes de réponses, tout le monde peut jouer (première réponse de chacun)
+            view = AnswerView(REACTIONS[:len(all_choices)], timeout=ROUND_SECONDS)
+            await self.bot.outbound.edit(countdown_msg, priority=ANSWER, content=None, embed=embed, view=view, **extra)
+
+            # 🧩 Mode progressif : image de plus en plus nette pendant la manche
+            reveal_task = None
+            if frames and len(frames) > 1:
+                reveal_task = asyncio.create_task(self.reveal_frames(countdown_msg, frames[1:]))
+
+            await view.wait()
+            if reveal_task:
+                reveal_task.cancel()
+            users_answers = dict(view.answers)
+
+            # 🏁 Fin de manche : bonne réponse indiquée, illustration complète affichée
+            if frames:
+                extra = {"embed": embed_choices, "attachments": []}
+            await self.bot.outbound.edit(countdown_msg, priority=ANSWER, view=view.reveal(correct_index), **extra)
+
+            # Enregistrement des scores (en mémoire, envoyés à Supabase en différé par bot.streak_buffer)
             for user_id, choice_index in users_answers.items():
-                correct = (choice_index == correct_index)
-                response = supabase.table("ygo_streaks").select("illu_streak,best_illustreak").eq("user_id", user_id).execute()
-                data = response.data
-                if data:
-                    current_streak = data[0].get("illu_streak") or 0
-                    best_streak = data[0].get("best_illustreak") or 0
-                else:
-                    current_streak = 0
-                    best_streak = 0
-
-                if correct:
-                    current_streak += 1
-                    if current_streak > best_streak:
-                        best_streak = current_streak
-                else:
-                    current_streak = 0
-
-                supabase.table("ygo_streaks").upsert({
-                    "user_id": user_id,
-                    "illu_streak": current_streak,
-                    "best_illustreak": best_streak
-                }).execute()
-
-            # Préparation du message final combiné
-
-            # Récupérer streaks pour tous les joueurs ayant répondu
-            user_streaks = []
-            for user_id in users_answers.keys():
-                response = supabase.table("ygo_streaks").select("illu_streak,best_illustreak").eq("user_id", user_id).execute()
-                data = response.data
-                if data:
-                    current_streak = data[0].get("illu_streak") or 0
-                    best_streak = data[0].get("best_illustreak") or 0
-                else:
-                    current_streak = 0
-                    best_streak = 0
-                user_streaks.append((user_id, current_streak, best_streak))
+                self.bot.streak_buffer.record("illu", user_id, correct=(choice_index == correct_index))
+
+            # Préparation du message final combiné : séries de tous les joueurs en une lecture
+            rows = await self.bot.streak_buffer.get_rows(users_answers.keys())
+            user_streaks = [
+                (int(row["user_id"]), row.get("illu_streak") or 0, row.get("best_illustreak") or 0)
+                for row in rows.values()
+            ]
 
             # Trier par meilleure série actuelle décroissante
             user_streaks.sort(key=lambda x: x[1], reverse=True)
@@ -190,23 +190,22 @@ class IllustrationCommand(commands.Cog):
             # Construction du texte du classement
             classement_lines = []
             for rank, (user_id, current_streak, best_streak) in enumerate(user_streaks, start=1):
-                user = self.bot.get_user(user_id)
-                if user:
-                    classement_lines.append(f"#{rank} **{user}** — Série actuelle: `{current_streak}`, meilleure série: `{best_streak}`")
+                name = self.bot.user_cache.display_name(user_id, ctx.guild)
+                classement_lines.append(f"#{rank} **{name}** — Série actuelle: `{current_streak}`, meilleure série: `{best_streak}`")
 
             classement_text = "\n".join(classement_lines) if classement_lines else "Aucun score enregistré."
 
             # Liste des gagnants (bonne réponse)
-            winners = [self.bot.get_user(uid) for uid, idx in users_answers.items() if idx == correct_index]
+            winners = [uid for uid, idx in users_answers.items() if idx == correct_index]
             if winners:
-                winners_mentions = ", ".join(user.mention for user in winners if user)
+                winners_mentions = ", ".join(f"<@{uid}>" for uid in winners)
                 result_text = f"🎉 Bravo à : {winners_mentions} pour leur bonne réponse !"
             else:
                 result_text = "Personne n’a trouvé la bonne réponse cette fois."
 
             # Envoi d'un seul message avec tout
             await ctx.send(
-                f"⏳ Temps écoulé ! La bonne réponse était **{true_card['name']}**.\n"
+                f"⏳ Temps écoulé ! La bonne réponse était **{true_card.name}**.\n"
                 f"{result_text}\n\n"
                 f"📊 **Classement des séries actuelles et meilleures :**\n{classement_text}\n\n"
             )
@@ -9,33 +9,32 @@
 # ────────────────────────────────────────────────────────────────
 import discord                               # 📘 API Discord
 from discord.ext import commands            # 🛠️ Extensions pour commandes
-import aiohttp                               # 🌐 Requêtes HTTP asynchrones
 import random                                # 🎲 Choix aléatoires
-import asyncio                               # ⏳ Timeout & délais
 import re                                    # ✂️ Remplacement avec RegEx
-from supabase_client import supabase         # ☁️ Base de données Supabase
+from utils.card_store import card_family, display  # 🃏 Cartes compactes du catalogue
+from utils.answer_view import AnswerView          # 🎛️ Boutons de réponse
+from utils.round_pool import RoundPool            # 📦 Manches préparées en tâche de fond
+from collections import namedtuple                # 🧾 Manche prête
 
 # Réactions pour les 4 propositions
 REACTIONS = ["🇦", "🇧", "🇨", "🇩"]
 
+# Manche prête : carte mystère, index de la bonne réponse, embed à envoyer
+QuestionRound = namedtuple("QuestionRound", ["card", "correct_index", "embed"])
+
 # ────────────────────────────────────────────────────────────────
 # 🧩 CLASSE DU COG
 # ────────────────────────────────────────────────────────────────
 class Question(commands.Cog):
     def __init__(self, bot):
         self.bot = bot  # 🔁 Référence au bot
+        self.pool = RoundPool(bot, self.build_round)  # 📦 Manches prêtes à l'avance
 
-    # ────────────────────────────────────────────────────────
-    # 🔄 Récupère un échantillon aléatoire de cartes
-    # ────────────────────────────────────────────────────────
-    async def fetch_card_sample(self, limit=100):
-        url = "https://db.ygoprodeck.com/api/v7/cardinfo.php?language=fr"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return []
-                data = await resp.json()
-                return random.sample(data.get("data", []), min(limit, len(data.get("data", []))))
+    async def cog_load(self):
+        self.pool.start()
+
+    def cog_unload(self):
+        self.pool.stop()
 
     # ────────────────────────────────────────────────────────
     # 🔒 Censure le nom de la carte dans sa description
@@ -44,28 +43,85 @@ class Question(commands.Cog):
         return re.sub(re.escape(name), "█" * len(name), desc, flags=re.IGNORECASE)
 
     # ────────────────────────────────────────────────────────
-    # 🔁 Met à jour le streak de l’utilisateur
+    # 🧪 Préparation d’une manche (tâche de fond, voir utils/round_pool.py)
     # ────────────────────────────────────────────────────────
-    async def update_streak(self, user_id: str, correct: bool):
-        data = supabase.table("ygo_streaks").select("*").eq("user_id", user_id).execute()
-        row = data.data[0] if data.data else None
-
-        if row:
-            current = row["current_streak"]
-            best = row.get("best_streak", 0)
-            new_streak = current + 1 if correct else 0
-
-            update_data = {"current_streak": new_streak}
-            if correct and new_streak > best:
-                update_data["best_streak"] = new_streak
-
-            supabase.table("ygo_streaks").update(update_data).eq("user_id", user_id).execute()
+    def build_round(self, store):
+        # ───────────────────────────────
+        # 🧪 Étape 1 : Carte mystère (catalogue en mémoire)
+        # ───────────────────────────────
+        main_card = random.choice(store.cards)
+
+        # ───────────────────────────────
+        # 🧩 Étape 2 : Sélection des propositions (index, aucune requête réseau)
+        # ───────────────────────────────
+        archetype = main_card.archetype
+        type_group = card_family(main_card.type)
+
+        if archetype:
+            # 🔁 Même archétype et même type, sinon même archétype et même famille
+            arch_cards = store.by_archetype.get(archetype, [])
+            groups = [
+                [c for c in arch_cards if c.type == main_card.type],
+                [c for c in arch_cards if card_family(c.type) == type_group],
+            ]
         else:
-            supabase.table("ygo_streaks").insert({
-                "user_id": user_id,
-                "current_streak": 1 if correct else 0,
-                "best_streak": 1 if correct else 0
-            }).execute()
+            # ▶️ Si pas d’archétype : même type, sans archétype
+            groups = [store.by_type_no_archetype.get(main_card.type, [])]
+
+        # 🔁 Fallbacks si pas assez de cartes : même grande famille, puis tout le catalogue
+        groups += [store.by_family.get(type_group, []), store.cards]
+
+        wrongs = []
+        for group in groups:
+            wrongs = store.sample_distractors(group, main_card, 3)
+            if len(wrongs) == 3:
+                break
+        if len(wrongs) < 3:
+            return None
+
+        # ───────────────────────────────
+        # 📊 Étape 3 : Construction du quiz
+        # ───────────────────────────────
+        true_card = main_card
+        all_choices = [true_card.name] + [c.name for c in wrongs]
+        random.shuffle(all_choices)
+
+        # 🕶️ Censure description
+        censored = self.censor_card_name(true_card.desc, true_card.name)
+
+        # 📎 Image
+        image_url = true_card.image_url_cropped
+
+        # 🧾 Construction de l'embed
+        embed = discord.Embed(
+            title="🧠 Quelle est cette carte ?",
+            description=(
+                f"📘 **Type :** {display(true_card.type)}\n"
+                f"📝 **Description :**\n*{censored[:500]}{'...' if len(censored) > 300 else ''}*"
+            ),
+            color=discord.Color.purple()
+        )
+        embed.set_author(name="YGO Quiz", icon_url="https://cdn-icons-png.flaticon.com/512/361/361678.png")
+        if image_url:
+            embed.set_thumbnail(url=image_url)
+
+        embed.add_field(name="🔹 Archétype", value=f"||{archetype or 'Aucun'}||", inline=False)
+
+        # 💥 Statistiques (si monstre)
+        if true_card.is_monster:
+            embed.add_field(name="💥 ATK", value=display(true_card.atk), inline=True)
+            embed.add_field(name="🛡️ DEF", value=display(true_card.defense), inline=True)
+            embed.add_field(name="⭐ Niveau", value=display(true_card.level), inline=True)
+            embed.add_field(name="🌪️ Attribut", value=display(true_card.attribute), inline=True)
+
+        embed.add_field(
+            name="❓ Choisis la bonne carte :",
+            value="\n".join(f"{REACTIONS[i]} {name}" for i, name in enumerate(all_choices)),
+            inline=False
+        )
+        embed.set_footer(text="Clique sur le bouton correspondant à ta réponse👇\n Fais questionscore (ou qs) pour voir ton score et questionscoretop (ou qst) pour voir les meilleurs score de tous les joueurs.")
+
+        return QuestionRound(true_card, all_choices.index(true_card.name), embed)
 
     # ────────────────────────────────────────────────────────────────
     # ❓ COMMANDE !question
@@ -79,143 +135,35 @@ class Question(commands.Cog):
     @commands.cooldown(rate=1, per=8, type=commands.BucketType.user)
     async def Question(self, ctx):
         try:
-            # ───────────────────────────────
-            # 🧪 Étape 1 : Échantillon initial
-            # ───────────────────────────────
-            sample = await self.fetch_card_sample(limit=60)
-            random.shuffle(sample)
-
-            # 🔍 Trouver une carte avec nom + description
-            main_card = next((c for c in sample if "name" in c and "desc" in c), None)
-            if not main_card:
+            # 📦 Manche préparée à l'avance (carte, propositions, embed)
+            round_ = await self.pool.get()
+            if round_ is None:
                 await ctx.send("❌ Aucune carte trouvée.")
                 return
+            true_card, correct_index, embed = round_
 
-            # ───────────────────────────────
-            # 🧩 Étape 2 : Sélection des propositions
-            # ───────────────────────────────
-            archetype = main_card.get("archetype")
-            main_type = main_card.get("type", "").lower()
-            type_group = "monstre" if "monstre" in main_type else ("magie" if "magie" in main_type else "piège")
-
-            group = []
-
-            # ▶️ Si pas d’archétype : filtrer par type
-            if not archetype:
-                group = [
-                    c for c in sample
-                    if c.get("name") != main_card["name"]
-                    and "desc" in c
-                    and c.get("type", "").lower() == main_type
-                    and not c.get("archetype") 
-                ]
-            else:
-                # 🔁 Tentative de récupération par archétype
-                url = f"https://db.ygoprodeck.com/api/v7/cardinfo.php?archetype={archetype}&language=fr"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            arch_sample = random.sample(data.get("data", []), min(60, len(data.get("data", []))))
-                            group = [
-                                c for c in arch_sample
-                                if c.get("name") != main_card["name"]
-                                and "desc" in c
-                                and c.get("type", "").lower() == main_type
-                            ]
-                            # 🔄 Sinon : même grande famille
-                            if len(group) < 3:
-                                group = [
-                                    c for c in arch_sample
-                                    if c.get("name") != main_card["name"]
-                                    and "desc" in c
-                                    and type_group in c.get("type", "").lower()
-                                ]
-
-            # 🔁 Fallbacks si pas assez de cartes
-            if len(group) < 3:
-                group = [
-                    c for c in sample
-                    if c.get("name") != main_card["name"]
-                    and "desc" in c
-                    and type_group in c.get("type", "").lower()
-                ]
-
-            if len(group) < 3:
-                group = random.sample(
-                    [c for c in sample if c.get("name") != main_card["name"] and "desc" in c],
-                    3
-                )
-
-            # ───────────────────────────────
-            # 📊 Étape 3 : Construction du quiz
-            # ───────────────────────────────
-            true_card = main_card
-            wrongs = random.sample(group, 3)
-            all_choices = [true_card["name"]] + [c["name"] for c in wrongs]
-            random.shuffle(all_choices)
-
-            # 🕶️ Censure description
-            censored = self.censor_card_name(true_card["desc"], true_card["name"])
-
-            # 📎 Image
-            image_url = true_card.get("card_images", [{}])[0].get("image_url_cropped")
-
-            # 🧾 Construction de l'embed
-            embed = discord.Embed(
-                title="🧠 Quelle est cette carte ?",
-                description=(
-                    f"📘 **Type :** {true_card.get('type', '—')}\n"
-                    f"📝 **Description :**\n*{censored[:500]}{'...' if len(censored) > 300 else ''}*"
-                ),
-                color=discord.Color.purple()
-            )
-            embed.set_author(name="YGO Quiz", icon_url="https://cdn-icons-png.flaticon.com/512/361/361678.png")
-            if image_url:
-                embed.set_thumbnail(url=image_url)
-
-            embed.add_field(name="🔹 Archétype", value=f"||{archetype or 'Aucun'}||", inline=False)
-
-            # 💥 Statistiques (si monstre)
-            if main_type.startswith("monstre"):
-                embed.add_field(name="💥 ATK", value=str(true_card.get("atk", "—")), inline=True)
-                embed.add_field(name="🛡️ DEF", value=str(true_card.get("def", "—")), inline=True)
-                embed.add_field(name="⭐ Niveau", value=str(true_card.get("level", "—")), inline=True)
-                embed.add_field(name="🌪️ Attribut", value=true_card.get("attribute", "—"), inline=True)
-
-            embed.add_field(
-                name="❓ Choisis la bonne carte :",
-                value="\n".join(f"{REACTIONS[i]} {name}" for i, name in enumerate(all_choices)),
-                inline=False
-            )
-            embed.set_footer(text="Réagis avec l'emoji correspondant à ta réponse👇\n Fais questionscore (ou qs) pour voir ton score et questionscoretop (ou qst) pour voir les meilleurs score de tous les joueurs.")
-
-            # Envoi de l'embed + réactions
-            msg = await ctx.send(embed=embed)
-            for emoji in REACTIONS[:4]:
-                await msg.add_reaction(emoji)
-
-            # ⏳ Attente de la réaction
-            def check(reaction, user):
-                return user == ctx.author and reaction.message.id == msg.id and str(reaction.emoji) in REACTIONS
-
-            try:
-                reaction, _ = await self.bot.wait_for("reaction_add", timeout=600.0, check=check)
-            except asyncio.TimeoutError:
+            # Envoi de l'embed avec les boutons de réponse (un seul appel)
+            view = AnswerView(REACTIONS[:4], timeout=600.0, user_id=ctx.author.id)
+            msg = await ctx.send(embed=embed, view=view)
+
+            # ⏳ Attente de la réponse
+            await view.wait()
+            await msg.edit(view=view.reveal(correct_index))
+            if ctx.author.id not in view.answers:
                 await ctx.send("⏰ Temps écoulé !")
                 return
 
             # 📈 Résultat
-            selected_index = REACTIONS.index(str(reaction.emoji))
-            correct_index = all_choices.index(true_card["name"])
+            selected_index = view.answers[ctx.author.id]
             user_id = str(ctx.author.id)
 
+            # 📝 Série notée en mémoire, envoyée à Supabase en différé (bot.streak_buffer)
             if selected_index == correct_index:
-                await self.update_streak(user_id, correct=True)
-                await ctx.send(f"✅ Bonne réponse ! C’était **{true_card['name']}**.")
+                self.bot.streak_buffer.record("question", user_id, correct=True)
+                await ctx.send(f"✅ Bonne réponse ! C’était **{true_card.name}**.")
             else:
-                await self.update_streak(user_id, correct=False)
-                await ctx.send(f"❌ Mauvaise réponse ! C’était **{true_card['name']}**.")
+                self.bot.streak_buffer.record("question", user_id, correct=False)
+                await ctx.send(f"❌ Mauvaise réponse ! C’était **{true_card.name}**.")
 
         except Exception as e:
             print("[ERREUR QUESTION]", e)
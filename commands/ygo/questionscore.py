@@ -11,7 +11,6 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import discord                                 # Pour envoyer des messages embed ou texte
 from discord.ext import commands              # Pour créer une commande dans un Cog
-from supabase_client import supabase          # Client Supabase déjà configuré et connecté
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal — Gestion de la commande !streak
@@ -46,14 +45,11 @@ class Streak(commands.Cog):
             # Objectif : récupérer les champs current_streak et best_streak
             # Filtrage sur : user_id == ID de l'utilisateur appelant
             # ────────────────────────────────────────────────────────────────────
-            response = supabase.table("ygo_streaks") \
-                .select("current_streak", "best_streak") \
-                .eq("user_id", user_id) \
-                .execute()
+            # (réponses pas encore envoyées incluses, voir utils/streak_buffer.py)
+            streak = await self.bot.streak_buffer.get_row(user_id)  # 📄 Ligne de l'utilisateur (ou None)
 
             # ✅ Si des données existent pour cet utilisateur
-            if response.data:
-                streak = response.data[0]  # 📄 On récupère la première ligne (il ne devrait y en avoir qu'une)
+            if streak:
                 current = streak.get("current_streak", 0)  # 🔁 Streak actuel
                 best = streak.get("best_streak", 0)        # 🏆 Meilleur record
 
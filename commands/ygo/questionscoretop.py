@@ -1,7 +1,8 @@
 # ────────────────────────────────────────────────────────────────────────────────
-# 🏆 topqs.py — Commande !topqs
-# Objectif : Afficher le top 10 des meilleures séries de bonnes réponses (streak)
-# Source : Table Supabase "ygo_streaks"
+# 🏆 topqs.py — Commandes !questionscoretop et !illustrationscoretop
+# Objectif : Afficher le classement des meilleures séries de bonnes réponses (streak)
+#            de !question et de !illustration, par serveur ou global, avec pagination
+# Source : Classements en mémoire (bot.leaderboard, alimenté par la table "ygo_streaks")
 # Langue : 🇫🇷 Français uniquement
 # ────────────────────────────────────────────────────────────────────────────────
 
@@ -10,88 +11,146 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import discord                                 # Pour créer des embeds Discord
 from discord.ext import commands              # Pour créer des commandes dans un Cog
-from supabase_client import supabase          # Client Supabase configuré (connexion active)
+from discord.ui import View, Button           # Boutons de pagination
+import math
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🧠 Cog principal — Gestion de la commande !topqs
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+PER_PAGE = 10  # 📄 Joueurs par page
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎛️ UI — Pagination du classement
+# ────────────────────────────────────────────────────────────────────────────────
+class LeaderboardView(View):
+    def __init__(self, title, entries, render, footer):
+        super().__init__(timeout=180)
+        self.title = title
+        self.entries = entries
+        self.render = render    # (rang, user_id, score) -> ligne ; noms lus au moment d’afficher la page
+        self.footer = footer
+        self.page = 0
+        self.total_pages = max(1, math.ceil(len(self.entries) / PER_PAGE))
+
+        if self.total_pages > 1:
+            self.add_item(PrevButton(self))
+            self.add_item(NextButton(self))
+
+    def create_embed(self):
+        start = self.page * PER_PAGE
+        embed = discord.Embed(
+            title=f"{self.title} — Page {self.page + 1}/{self.total_pages}",
+            description="\n".join(self.render(entry) for entry in self.entries[start:start + PER_PAGE]),
+            color=discord.Color.gold()
+        )
+        embed.set_footer(text=self.footer)
+        return embed
+
+class PrevButton(Button):
+    def __init__(self, paginator):
+        super().__init__(label="◀️", style=discord.ButtonStyle.primary)
+        self.paginator = paginator
+
+    async def callback(self, interaction: discord.Interaction):
+        if self.paginator.page > 0:
+            self.paginator.page -= 1
+        await interaction.response.edit_message(embed=self.paginator.create_embed(), view=self.paginator)
+
+class NextButton(Button):
+    def __init__(self, paginator):
+        super().__init__(label="▶️", style=discord.ButtonStyle.primary)
+        self.paginator = paginator
+
+    async def callback(self, interaction: discord.Interaction):
+        if self.paginator.page < self.paginator.total_pages - 1:
+            self.paginator.page += 1
+        await interaction.response.edit_message(embed=self.paginator.create_embed(), view=self.paginator)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal — Gestion des commandes de classement
 # ────────────────────────────────────────────────────────────────────────────────
 class TopQS(commands.Cog):
     """
-    🏅 Commande !topqs : affiche le classement des meilleurs streaks de bonnes réponses.
+    🏅 Commandes !questionscoretop et !illustrationscoretop : classements des meilleurs streaks.
     """
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot  # 🔗 Référence au bot principal
 
+    async def send_leaderboard(self, ctx: commands.Context, board_name: str, title: str, scope: str):
+        """Construit et envoie le classement demandé (serveur courant, ou global)."""
+        if not await self.bot.leaderboard.wait_ready():
+            await ctx.send("📉 Classement indisponible pour le moment, réessaie dans quelques instants.")
+            return
+        board = self.bot.leaderboard.boards[board_name]
+
+        # 🌍 Par défaut, seuls les membres du serveur ; « global » pour tout le monde
+        guild = ctx.guild if scope.lower() != "global" else None
+        keep = (lambda uid: guild.get_member(int(uid)) is not None) if guild else None
+        entries = board.entries(keep)
+
+        # 📉 Si aucun résultat (aucun streak enregistré)
+        if not entries:
+            await ctx.send("📉 Aucun streak enregistré pour le moment.")
+            return
+
+        user_cache = self.bot.user_cache
+
+        def render(entry):
+            rank, user_id, score = entry
+            # 🥇🥈🥉 Icônes spéciales pour les 3 premiers
+            place = {1: "🥇", 2: "🥈", 3: "🥉"}.get(rank, f"`#{rank}`")
+            return f"{place} **{user_cache.display_name(user_id, ctx.guild)}** : 🔥 {score}"
+
+        # 👤 Noms lus dans le cache ; les inconnus des premières pages sont résolus en fond
+        user_cache.prefetch([user_id for _, user_id, _ in entries[:PER_PAGE * 3]])
+
+        where = f"serveur {guild.name}" if guild else "global"
+        view = LeaderboardView(
+            f"{title} ({where})",
+            entries,
+            render,
+            f"Classement basé sur la meilleure série atteinte. {ctx.prefix}{ctx.invoked_with} global pour le classement global."
+        )
+        await ctx.send(embed=view.create_embed(), view=view)
+
     # ────────────────────────────────────────────────────────────────────────────
-    # 📈 Commande !topqs — Top 10 meilleurs streaks
+    # 📈 Commande !questionscoretop — Meilleurs streaks de !question
     # ────────────────────────────────────────────────────────────────────────────
     @commands.command(
         name="questionscoretop",                                     # Nom principal de la commande
         aliases=["qst", "qstop"],                    # Alias utilisables
         help="Affiche le classement des meilleures séries de bonnes réponses."  # Aide courte
     )
-    async def topqs(self, ctx: commands.Context):
+    async def topqs(self, ctx: commands.Context, scope: str = ""):
         """
-        📊 Récupère depuis Supabase le top 10 des utilisateurs ayant les meilleurs streaks.
+        📊 Classement des meilleures séries !question (serveur, ou `global`).
         """
-
         try:
-            # ────────────────────────────────────────────────────────────────────
-            # 🔎 Requête Supabase : on trie les utilisateurs par best_streak DESC
-            # ────────────────────────────────────────────────────────────────────
-            response = supabase.table("ygo_streaks") \
-                .select("user_id, best_streak") \
-                .order("best_streak", desc=True) \
-                .limit(10) \
-                .execute()
-
-            # 📉 Si aucun résultat (aucun streak enregistré)
-            if not response.data:
-                await ctx.send("📉 Aucun streak enregistré pour le moment.")
-                return
-
-            # ────────────────────────────────────────────────────────────────────
-            # 🏅 Construction du classement
-            # ────────────────────────────────────────────────────────────────────
-            leaderboard = []  # 🧾 Liste qui contiendra les lignes du classement
-
-            for index, row in enumerate(response.data, start=1):
-                user_id = row["user_id"]
-                best_streak = row.get("best_streak", 0)
-
-                try:
-                    # 👤 On tente de récupérer le nom Discord de l'utilisateur
-                    user = await self.bot.fetch_user(int(user_id))
-                    username = user.name if user else f"Utilisateur inconnu ({user_id})"
-                except:
-                    # ❓ Si utilisateur introuvable (peut-être a-t-il quitté le serveur)
-                    username = f"Utilisateur inconnu ({user_id})"
-
-                # 🥇🥈🥉 Icônes spéciales pour les 3 premiers
-                place = {1: "🥇", 2: "🥈", 3: "🥉"}.get(index, f"`#{index}`")
-
-                # ➕ Ajout de la ligne dans le classement
-                leaderboard.append(f"{place} **{username}** : 🔥 {best_streak}")
-
-            # ────────────────────────────────────────────────────────────────────
-            # 🖼️ Création de l'embed de réponse avec le top 10
-            # ────────────────────────────────────────────────────────────────────
-            embed = discord.Embed(
-                title="🏆 Top 10 – Meilleures Séries",
-                description="\n".join(leaderboard),  # 🪄 Ajoute les lignes une à une
-                color=discord.Color.gold()
-            )
-            embed.set_footer(text="Classement basé sur la meilleure série atteinte.")
-
-            # 📤 Envoi du classement dans le salon
-            await ctx.send(embed=embed)
-
+            await self.send_leaderboard(ctx, "question", "🏆 Meilleures Séries", scope)
         except Exception as e:
             # 🚨 Gestion d’erreur (log + message utilisateur)
             print("[ERREUR TOPQS]", e)
             await ctx.send("🚨 Une erreur est survenue lors du classement.")
 
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🖼️ Commande !illustrationscoretop — Meilleurs streaks de !illustration
+    # ────────────────────────────────────────────────────────────────────────────
+    @commands.command(
+        name="illustrationscoretop",
+        aliases=["ist", "illutop"],
+        help="Affiche le classement des meilleures séries de !illustration."
+    )
+    async def topillu(self, ctx: commands.Context, scope: str = ""):
+        """
+        📊 Classement des meilleures séries !illustration (serveur, ou `global`).
+        """
+        try:
+            await self.send_leaderboard(ctx, "illu", "🖼️ Meilleures Séries Illustration", scope)
+        except Exception as e:
+            print("[ERREUR TOPILLU]", e)
+            await ctx.send("🚨 Une erreur est survenue lors du classement.")
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Fonction de setup du Cog
 # Objectif : Charger le cog et l’ajouter dans une catégorie personnalisée
@@ -10,8 +10,8 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import discord                                 # Outils pour embeds Discord
 from discord.ext import commands              # Gestion des commandes dans un Cog
-import aiohttp                                 # Requêtes HTTP asynchrones
 import random                                  # Sélection aléatoire
+from utils.card_store import display           # Affichage des champs optionnels
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📘 Classe principale du Cog de commande !random
@@ -31,36 +31,29 @@ class Random(commands.Cog):
     @commands.cooldown(1, 5, commands.BucketType.user)  # ⏱️ 1 utilisation toutes les 5s par utilisateur
     async def random_card(self, ctx: commands.Context):
         """
-        📥 Récupère une carte Yu-Gi-Oh! aléatoire depuis l’API (langue : français)
+        📥 Tire une carte Yu-Gi-Oh! aléatoire dans le catalogue partagé (langue : français)
         et l'affiche joliment dans un embed Discord.
         """
 
         # ────────────────────────────────────────────────────────────────────────
-        # 🔗 Requête API vers la base de cartes Yu-Gi-Oh! (langue française)
+        # 📚 Lecture du catalogue partagé (chargé une seule fois par le bot)
         # ────────────────────────────────────────────────────────────────────────
-        url = "https://db.ygoprodeck.com/api/v7/cardinfo.php?language=fr"
+        cartes = await self.bot.card_catalog.get_cards()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    await ctx.send("❌ Erreur lors de l'accès à l'API.")
-                    return
-                data = await resp.json()
-
-        # 🔍 Vérification des données renvoyées
-        if "data" not in data:
-            await ctx.send("❌ Données invalides reçues depuis l’API.")
+        # 🔍 Vérification des données disponibles
+        if not cartes:
+            await ctx.send("❌ Erreur lors de l'accès à l'API.")
             return
 
         # 🎯 Tirage d’une carte au hasard parmi toutes celles disponibles
-        carte = random.choice(data["data"])
+        carte = random.choice(cartes)
 
         # ────────────────────────────────────────────────────────────────────────
         # 🖼️ Création de l’embed de réponse avec les infos de la carte
         # ────────────────────────────────────────────────────────────────────────
         embed = discord.Embed(
-            title=carte["name"],  # 🏷️ Nom de la carte
-            description=carte.get("desc", "Pas de description disponible."),  # 📖 Description de la carte
+            title=carte.name,  # 🏷️ Nom de la carte
+            description=carte.desc or "Pas de description disponible.",  # 📖 Description de la carte
             color=discord.Color.gold()  # 🎨 Couleur dorée
         )
 
@@ -70,33 +63,33 @@ class Random(commands.Cog):
         )
 
         # ➕ Champ : Type de la carte (ex : Monstre, Magie, Piège)
-        embed.add_field(name="🧪 Type", value=carte.get("type", "—"), inline=True)
+        embed.add_field(name="🧪 Type", value=display(carte.type), inline=True)
 
         # 📊 Si c’est une carte Monstre, ajouter ses stats complémentaires
-        if carte.get("type", "").lower().startswith("monstre"):
+        if carte.is_monster:
             embed.add_field(
                 name="⚔️ ATK / DEF",
-                value=f"{carte.get('atk', '—')} / {carte.get('def', '—')}",
+                value=f"{display(carte.atk)} / {display(carte.defense)}",
                 inline=True
             )
             embed.add_field(
                 name="⭐ Niveau / Rang",
-                value=str(carte.get("level", "—")),
+                value=display(carte.level),
                 inline=True
             )
             embed.add_field(
                 name="🌪️ Attribut",
-                value=carte.get("attribute", "—"),
+                value=display(carte.attribute),
                 inline=True
             )
             embed.add_field(
                 name="👹 Race",
-                value=carte.get("race", "—"),
+                value=display(carte.race),
                 inline=True
             )
 
         # 🖼️ Image de la carte (miniature)
-        image_url = carte.get("card_images", [{}])[0].get("image_url")
+        image_url = carte.image_url
         if image_url:
             embed.set_thumbnail(url=image_url)
 
@@ -12,6 +12,7 @@ import discord
 from discord.ext import commands
 import json
 import os
+from utils.outbound import INTERACTIVE, COSMETIC  # 📤 Priorités des envois (bot.outbound)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Chargement des données JSON
@@ -96,28 +97,29 @@ class VocabulaireCommand(commands.Cog):
         await message.add_reaction("◀️")
         await message.add_reaction("▶️")
 
-        def check(reaction, user):
-            return (
-                user == ctx.author and
-                reaction.message.id == message.id and
-                str(reaction.emoji) in ["◀️", "▶️"]
-            )
-
         index = 0
-        while True:
-            try:
-                reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
-                await message.remove_reaction(reaction, user)
-
-                if str(reaction.emoji) == "▶️":
-                    index = (index + 1) % len(pages)
-                elif str(reaction.emoji) == "◀️":
-                    index = (index - 1) % len(pages)
-
-                await message.edit(embed=pages[index])
-
-            except Exception:
-                break  # Timeout ou erreur
+        # ⏳ Pagination par l'auteur, fermée après 60 secondes sans réaction
+        with self.bot.interactions.session(message.id, timeout=60.0, emojis=["◀️", "▶️"], user_id=ctx.author.id) as session:
+            while True:
+                try:
+                    payload = await session.next()
+                    session.touch(60.0)
+                    if str(payload.emoji) == "▶️":
+                        index = (index + 1) % len(pages)
+                    elif str(payload.emoji) == "◀️":
+                        index = (index - 1) % len(pages)
+
+                    # 📤 Clics rapides : seule la dernière page est envoyée ; le retrait
+                    # de la réaction passe après les réponses du salon
+                    self.bot.outbound.edit(message, priority=INTERACTIVE, embed=pages[index])
+                    self.bot.outbound.submit(
+                        message.channel.id,
+                        lambda emoji=payload.emoji, user=discord.Object(id=payload.user_id): message.remove_reaction(emoji, user),
+                        priority=COSMETIC,
+                    )
+
+                except Exception:
+                    break  # Timeout ou erreur
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
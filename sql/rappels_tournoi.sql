@@ -0,0 +1,97 @@
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 📌 rappels_tournoi.sql — Planification et envoi des rappels de tournoi
+-- Objectif : - rappels_tournoi : inscrits au rappel du prochain tournoi ;
+--            - rappel_jobs : échéances (3 jours, 1 jour, 1 heure avant), persistées
+--              pour rattraper celles manquées pendant un arrêt du bot ;
+--            - rappels_envois : file d’envoi (outbox), une ligne par MP à envoyer,
+--              réservée avant l’envoi et supprimée seulement après un envoi réussi
+-- Utilisation : à exécuter une fois dans l’éditeur SQL de Supabase ;
+--               appelé par utils/database.py via supabase.rpc(...)
+-- ────────────────────────────────────────────────────────────────────────────────
+
+-- Une inscription par utilisateur (l’inscription est un upsert sur user_id)
+delete from rappels_tournoi a using rappels_tournoi b
+where a.user_id = b.user_id and a.ctid > b.ctid;
+create unique index if not exists rappels_tournoi_user_id_key on rappels_tournoi (user_id);
+
+-- ────────────────────────────────────────────────────────────────────────────────
+-- ⏰ Échéances
+-- ────────────────────────────────────────────────────────────────────────────────
+create table if not exists rappel_jobs (
+  tournoi_date timestamptz not null,
+  offset_key   text        not null,   -- '3j', '1j', '1h'
+  fire_at      timestamptz not null,
+  done_at      timestamptz,            -- null tant que l’échéance n’est pas traitée
+  primary key (tournoi_date, offset_key)
+);
+
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 📨 File d’envoi
+-- ────────────────────────────────────────────────────────────────────────────────
+create table if not exists rappels_envois (
+  user_id      text        not null,
+  tournoi_date timestamptz not null,
+  offset_key   text        not null,
+  claimed_by   text,
+  claimed_at   timestamptz,
+  attempts     int         not null default 0,
+  primary key (user_id, tournoi_date, offset_key)
+);
+
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 📥 Mise en file d’une échéance pour tous les inscrits
+-- Idempotent (une échéance rejouée après un crash ne double aucun MP).
+-- p_final : dernière échéance du tournoi → les inscriptions sont consommées.
+-- ────────────────────────────────────────────────────────────────────────────────
+create or replace function enqueue_rappels(p_tournoi_date timestamptz, p_offset text,
+                                           p_final boolean default false)
+returns int
+language plpgsql
+as $$
+declare
+  v_count int;
+begin
+  insert into rappels_envois (user_id, tournoi_date, offset_key)
+  select user_id, p_tournoi_date, p_offset from rappels_tournoi
+  on conflict do nothing;
+  get diagnostics v_count = row_count;
+
+  if p_final then
+    delete from rappels_tournoi t
+    where exists (select 1 from rappels_envois e
+                  where e.user_id = t.user_id
+                    and e.tournoi_date = p_tournoi_date
+                    and e.offset_key = p_offset);
+  end if;
+  return v_count;
+end;
+$$;
+
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 🔒 Réservation d’un lot de MP
+-- MP jamais réservés, ou dont la dernière réservation date de plus de
+-- p_stale_seconds : instance tombée en cours d’envoi, ou échec remis en file
+-- (le délai sert alors d’attente avant nouvel essai). Les MP abandonnés
+-- (attempts >= p_max_attempts) ne sont plus réservés ; ils sont supprimés avec
+-- les autres MP du tournoi une fois celui-ci commencé (Database.purge_rappels).
+-- skip locked : deux instances ne réservent jamais le même MP.
+-- ────────────────────────────────────────────────────────────────────────────────
+create or replace function claim_rappels(p_instance text, p_limit int,
+                                         p_stale_seconds int default 600,
+                                         p_max_attempts int default 5)
+returns setof rappels_envois
+language sql
+as $$
+  update rappels_envois as r set
+    claimed_by = p_instance,
+    claimed_at = now()
+  where (r.user_id, r.tournoi_date, r.offset_key) in (
+    select user_id, tournoi_date, offset_key from rappels_envois
+    where attempts < p_max_attempts
+      and (claimed_at is null or claimed_at < now() - make_interval(secs => p_stale_seconds))
+    order by tournoi_date, offset_key, user_id
+    limit p_limit
+    for update skip locked
+  )
+  returning r.*;
+$$;
@@ -0,0 +1,88 @@
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 📌 ygo_streaks.sql — Mise à jour atomique des séries (!question, !illustration)
+-- Objectif : Appliquer côté serveur, en une seule requête, les réponses accumulées
+--            par le tampon d’écriture (utils/streak_buffer.py), sans perte de mise à
+--            jour ni double application après un redémarrage
+-- Utilisation : à exécuter une fois dans l’éditeur SQL de Supabase ;
+--               appelé par utils/database.py via supabase.rpc(...)
+-- ────────────────────────────────────────────────────────────────────────────────
+
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 🧾 Lots déjà appliqués (rejouer un lot après un crash ne le compte pas deux fois)
+-- ────────────────────────────────────────────────────────────────────────────────
+create table if not exists streak_flushes (
+  batch_id   uuid primary key,
+  applied_at timestamptz not null default now()
+);
+
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 🔁 Application d’un lot de deltas
+-- p_deltas : [{"user_id": "123", "game": "question" | "illu",
+--              "reset": bool, "prefix_run": int, "max_run": int, "trailing_run": int}, ...]
+--
+-- Un delta résume une suite de réponses d’un joueur :
+--   - sans mauvaise réponse (reset = false) : prefix_run bonnes réponses à ajouter ;
+--   - sinon : prefix_run bonnes réponses avant la première erreur, max_run la plus
+--     longue série après celle-ci, trailing_run la série en cours à la fin.
+-- ────────────────────────────────────────────────────────────────────────────────
+create or replace function apply_streak_deltas(p_batch_id uuid, p_deltas jsonb)
+returns setof ygo_streaks
+language plpgsql
+as $$
+declare
+  v_users text[];
+begin
+  select array_agg(distinct d.user_id) into v_users
+  from jsonb_to_recordset(p_deltas) as d(user_id text);
+
+  insert into streak_flushes (batch_id) values (p_batch_id)
+  on conflict (batch_id) do nothing;
+
+  if found then
+    -- Lignes manquantes créées à zéro, puis mises à jour sous verrou de ligne
+    insert into ygo_streaks (user_id, current_streak, best_streak, illu_streak, best_illustreak)
+    select u, 0, 0, 0, 0 from unnest(v_users) as u
+    on conflict (user_id) do nothing;
+
+    update ygo_streaks as s set
+      current_streak = case when d.reset then d.trailing_run
+                            else coalesce(s.current_streak, 0) + d.prefix_run end,
+      best_streak    = greatest(coalesce(s.best_streak, 0),
+                                coalesce(s.current_streak, 0) + d.prefix_run,
+                                d.max_run)
+    from jsonb_to_recordset(p_deltas)
+         as d(user_id text, game text, reset boolean, prefix_run int, max_run int, trailing_run int)
+    where d.game = 'question' and s.user_id = d.user_id;
+
+    update ygo_streaks as s set
+      illu_streak     = case when d.reset then d.trailing_run
+                             else coalesce(s.illu_streak, 0) + d.prefix_run end,
+      best_illustreak = greatest(coalesce(s.best_illustreak, 0),
+                                 coalesce(s.illu_streak, 0) + d.prefix_run,
+                                 d.max_run)
+    from jsonb_to_recordset(p_deltas)
+         as d(user_id text, game text, reset boolean, prefix_run int, max_run int, trailing_run int)
+    where d.game = 'illu' and s.user_id = d.user_id;
+  end if;
+
+  return query select * from ygo_streaks where user_id = any(v_users);
+end;
+$$;
+
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 🔍 Lecture des séries + état d’un lot, dans un même instantané
+-- p_batch_id : lot envoyé dont la réponse n’est pas encore revenue ; applied dit
+-- si les lignes lues le contiennent déjà (le tampon ne le rajoute alors pas).
+-- Retour : {"rows": [lignes de ygo_streaks], "applied": bool}
+-- ────────────────────────────────────────────────────────────────────────────────
+create or replace function read_streaks(p_user_ids text[], p_batch_id uuid default null)
+returns jsonb
+language sql
+stable
+as $$
+  select jsonb_build_object(
+    'rows', coalesce((select jsonb_agg(to_jsonb(s)) from ygo_streaks s
+                      where s.user_id = any(p_user_ids)), '[]'::jsonb),
+    'applied', exists (select 1 from streak_flushes f where f.batch_id = p_batch_id)
+  );
+$$;
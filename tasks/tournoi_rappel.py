@@ -1,85 +1,185 @@
 # ────────────────────────────────────────────────────────────────────────────────
-# 📌 tournoi_rappel.py — Tâche quotidienne qui envoie les rappels de tournoi
-# Objectif : Envoyer un MP 3 jours avant la date du tournoi
+# 📌 tournoi_rappel.py — Planificateur des rappels de tournoi
+# Objectif : Envoyer un MP 3 jours, 1 jour et 1 heure avant la date du tournoi,
+#            à l'heure exacte, y compris après un redémarrage du bot
 # Catégorie : 🔁 Tâches planifiées
 # ────────────────────────────────────────────────────────────────────────────────
 
-import discord
-from discord.ext import tasks, commands
-import aiohttp
-import os
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime, timedelta, timezone
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+import pytz
+from discord.ext import commands
 
+from utils.database import db
+from utils.reminder_outbox import ReminderOutbox
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+PARIS = pytz.timezone("Europe/Paris")  # 🕰️ Fuseau des dates saisies avec !tournoidate
+
+# ⏰ Échéances (clé, délai avant le tournoi) ; la dernière consomme les inscriptions
+OFFSETS = (
+    ("3j", timedelta(days=3)),
+    ("1j", timedelta(days=1)),
+    ("1h", timedelta(hours=1)),
+)
+
+REFRESH_INTERVAL = 6 * 60 * 60   # 🔄 Relecture de tournoi_info (modifications hors du bot)
+RETRY_DELAY = 10 * 60            # 🔁 MP remis en file : nouvel envoi après 10 minutes
+ERROR_DELAY = 60                 # ⚠️ Après une erreur Supabase
+LEADER_CHECK = 60                # 🔐 Instance secondaire : revérifie si elle est devenue principale
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Fonctions utilitaires
+# ────────────────────────────────────────────────────────────────────────────────
+def parse_date(value):
+    """Date ISO → datetime avec fuseau (une date sans fuseau est une heure de Paris)."""
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value)
+    return PARIS.localize(dt) if dt.tzinfo is None else dt
+
+def format_remaining(delta: timedelta) -> str:
+    """« 3 jours », « 1 jour », « 1 heure »… (arrondi au plus proche)."""
+    hours = delta.total_seconds() / 3600
+    if hours >= 23.5:
+        days = round(hours / 24)
+        return f"{days} jour{'s' if days > 1 else ''}"
+    if hours >= 0.5:
+        hours = round(hours)
+        return f"{hours} heure{'s' if hours > 1 else ''}"
+    return "moins d’une heure"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog — Planificateur
+# ────────────────────────────────────────────────────────────────────────────────
 class TournoiRappelTask(commands.Cog):
+    """
+    Les échéances du prochain tournoi sont enregistrées dans rappel_jobs. La tâche
+    dort jusqu'à la prochaine échéance (ou jusqu'à wake(), appelé par !tournoidate),
+    puis met en file un MP par inscrit et vide la file (utils/reminder_outbox.py).
+    Au redémarrage, une échéance manquée est rattrapée si le tournoi n'a pas commencé ;
+    si plusieurs l'ont été, seule la plus récente est envoyée. Si la dernière est
+    manquée alors que le tournoi a commencé, les inscriptions sont tout de même
+    consommées, sans MP. Un changement de date, lui, conserve les inscriptions.
+    """
+
     def __init__(self, bot):
         self.bot = bot
-        self.rappel_tournoi.start()
+        self.outbox = ReminderOutbox(bot)
+        self._wake = asyncio.Event()
+        self._task = None
+
+    async def cog_load(self):
+        self._task = asyncio.create_task(self.scheduler())
 
     def cog_unload(self):
-        self.rappel_tournoi.cancel()
-
-    @tasks.loop(hours=24)
-    async def rappel_tournoi(self):
-        """Tâche qui s'exécute une fois par jour pour envoyer un rappel 3 jours avant le tournoi."""
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            print("[❌] Clés Supabase manquantes.")
-            return
-
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}"
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                # Récupération de la date du prochain tournoi
-                url = f"{SUPABASE_URL}/rest/v1/tournoi_info?select=prochaine_date&order=id.desc&limit=1"
-                async with session.get(url, headers=headers) as response:
-                    tournoi_data = await response.json()
-
-                if not tournoi_data or not tournoi_data[0].get("prochaine_date"):
-                    print("📭 Aucun tournoi trouvé.")
-                    return
-
-                tournoi_date = datetime.strptime(tournoi_data[0]["prochaine_date"], "%Y-%m-%d").date()
-                today = datetime.utcnow().date()
-
-                if tournoi_date != today + timedelta(days=3):
-                    print("⏳ Ce n’est pas encore le jour d’envoyer les rappels.")
-                    return
-
-                # Récupération des utilisateurs à rappeler
-                async with session.get(f"{SUPABASE_URL}/rest/v1/rappels_tournoi", headers=headers) as r:
-                    users = await r.json()
-
-                for user in users:
-                    user_id = int(user["user_id"])
-                    member = await self.bot.fetch_user(user_id)
-                    try:
-                        await member.send("📅 Rappel : Le tournoi commence dans **3 jours** ! Prépare ton deck 🧠")
-                    except discord.Forbidden:
-                        print(f"⚠️ Impossible d’envoyer un message à {user_id} (DM bloqués).")
-
-                # Optionnel : vider la table après envoi
-                await session.request(
-                    method="DELETE",
-                    url=f"{SUPABASE_URL}/rest/v1/rappels_tournoi",
-                    headers={**headers, "Content-Type": "application/json"},
-                )
-
-                print("✅ Tous les rappels ont été envoyés.")
-
-        except Exception as e:
-            print(f"[ERREUR RAPPEL TOURNOI] {e}")
-
-    @rappel_tournoi.before_loop
-    async def before_rappel(self):
+        if self._task:
+            self._task.cancel()
+
+    def wake(self):
+        """Replanifie immédiatement (nouvelle date de tournoi)."""
+        self._wake.set()
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ✉️ Texte des MP
+    # ────────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def render(row: dict) -> str:
+        tournoi_dt = parse_date(row["tournoi_date"])
+        remaining = format_remaining(tournoi_dt - datetime.now(timezone.utc))
+        when = tournoi_dt.astimezone(PARIS).strftime("%d/%m/%Y à %Hh%M")
+        return f"📅 Rappel : Le tournoi commence dans **{remaining}** ({when}) ! Prépare ton deck 🧠"
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ⏰ Échéances
+    # ────────────────────────────────────────────────────────────────────────────
+    async def fire_due(self, jobs: list, tournoi_dt, now) -> bool:
+        """Traite les échéances arrivées ; retourne True s'il reste des MP remis en file."""
+        due = []
+        for job in jobs:
+            job_dt = parse_date(job["tournoi_date"])
+            if job_dt <= now:
+                if job["offset_key"] == OFFSETS[-1][0]:
+                    # 🗑️ Dernière échéance manquée : inscriptions consommées, MP purgés ci-dessous
+                    await db.enqueue_rappels(job["tournoi_date"], job["offset_key"], True)
+                await db.finish_rappel_job(job, now.isoformat())  # 🗑️ Tournoi commencé
+            elif job_dt != tournoi_dt:
+                await db.finish_rappel_job(job, now.isoformat())  # 🗑️ Date changée
+            elif parse_date(job["fire_at"]) <= now:
+                due.append(job)
+
+        if due:
+            # ⏩ Plusieurs échéances manquées : seule la plus proche du tournoi est envoyée
+            due.sort(key=lambda j: parse_date(j["fire_at"]))
+            job = due[-1]
+            final = job["offset_key"] == OFFSETS[-1][0]
+            queued = await db.enqueue_rappels(job["tournoi_date"], job["offset_key"], final)
+            for done in due:
+                await db.finish_rappel_job(done, now.isoformat())
+            print(f"⏰ Rappel {job['offset_key']} : {queued} MP mis en file.")
+
+        # 🧹 MP des tournois commencés (abandonnés, ou trop tard pour être utiles)
+        await db.purge_rappels(now.isoformat())
+        counts = await self.outbox.dispatch(self.render)
+        if any(counts.values()):
+            print(f"✅ Rappels : {counts['envoyé']} envoyés, {counts['remis']} remis en file, "
+                  f"{counts['abandonné']} abandonnés.")
+        return counts["remis"] > 0
+
+    async def tick(self) -> float:
+        """Synchronise les échéances, envoie celles arrivées ; retourne le délai avant la suivante."""
+        now = datetime.now(timezone.utc)
+        cache = self.bot.tournoi_info
+        info = await cache.refresh() if cache.is_stale else await cache.get()
+        tournoi_dt = parse_date(info.get("prochaine_date")) if info else None
+
+        if tournoi_dt and tournoi_dt > now:
+            await db.ensure_rappel_jobs([
+                {
+                    "tournoi_date": tournoi_dt.isoformat(),
+                    "offset_key": key,
+                    "fire_at": (tournoi_dt - delta).isoformat(),
+                }
+                for key, delta in OFFSETS
+            ])
+
+        jobs = await db.pending_rappel_jobs()
+        leftovers = await self.fire_due(jobs, tournoi_dt, now)
+
+        delay = REFRESH_INTERVAL
+        upcoming = [
+            parse_date(job["fire_at"]) for job in jobs
+            if parse_date(job["tournoi_date"]) == tournoi_dt and parse_date(job["fire_at"]) > now
+        ]
+        if upcoming:
+            delay = min(delay, (min(upcoming) - datetime.now(timezone.utc)).total_seconds())
+        if leftovers:
+            delay = min(delay, RETRY_DELAY)
+        return max(delay, 1)
+
+    async def scheduler(self):
         await self.bot.wait_until_ready()
+        await self.bot.instance_lease.decided.wait()  # 🔐 Savoir si l'on est l'instance principale
+
+        while True:
+            if self.bot.is_main_instance:  # 🔐 Seule l'instance principale envoie les rappels
+                try:
+                    delay = await self.tick()
+                except Exception as e:
+                    print(f"[ERREUR RAPPEL TOURNOI] {e}")
+                    delay = ERROR_DELAY
+            else:
+                delay = LEADER_CHECK
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
 
 # 🔌 Setup
 async def setup(bot):
-    await bot.add_cog(Tourno
-iRappelTask(bot))
+    await bot.add_cog(TournoiRappelTask(bot))
@@ -0,0 +1,74 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 answer_view.py — Boutons de réponse des quiz (!question, !illustration, !quizz)
+# Objectif : Envoyer les choix avec le message (un seul appel REST au lieu d’un
+#            add_reaction par choix), compter les réponses en mémoire et confirmer
+#            chaque clic par un message éphémère
+# Utilisation : view = AnswerView(REACTIONS[:4], timeout=30, user_id=ctx.author.id)
+#               msg = await ctx.send(embed=embed, view=view)
+#               await view.wait() → view.answers {user_id: index du choix}
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import discord
+from discord.ui import View, Button
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎛️ UI — Boutons de réponse
+# ────────────────────────────────────────────────────────────────────────────────
+class AnswerView(View):
+    """
+    🎛️ Un bouton par choix.
+    - Solo (user_id donné) : seul ce joueur peut répondre, la vue s’arrête au premier clic.
+    - Multijoueur (user_id=None) : tout le monde répond jusqu’à la fin du délai,
+      seule la première réponse de chaque joueur compte.
+    """
+
+    def __init__(self, labels, timeout: float, user_id: int = None):
+        super().__init__(timeout=timeout)
+        self.labels = list(labels)
+        self.user_id = user_id
+        self.answers = {}    # 🧮 user_id -> index du choix (premier clic uniquement)
+        self.tally = [0] * len(self.labels)
+        for index, label in enumerate(self.labels):
+            self.add_item(AnswerButton(self, index, label))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.user_id is not None and interaction.user.id != self.user_id:
+            await interaction.response.send_message("❌ Ce n’est pas ta question.", ephemeral=True)
+            return False
+        return True
+
+    async def record(self, interaction: discord.Interaction, index: int):
+        user_id = interaction.user.id
+        if user_id in self.answers:
+            previous = self.labels[self.answers[user_id]]
+            await interaction.response.send_message(f"🔒 Tu as déjà répondu {previous}.", ephemeral=True)
+            return
+
+        self.answers[user_id] = index
+        self.tally[index] += 1
+        await interaction.response.send_message(f"✅ Réponse enregistrée : {self.labels[index]}", ephemeral=True)
+        if self.user_id is not None:
+            self.stop()
+
+    def reveal(self, correct_index: int) -> "AnswerView":
+        """Désactive les boutons, la bonne réponse en vert (avec le nombre de réponses par choix)."""
+        for item in self.children:
+            item.disabled = True
+            if self.user_id is None:
+                item.label = str(self.tally[item.index])
+            if item.index == correct_index:
+                item.style = discord.ButtonStyle.success
+        self.stop()
+        return self
+
+class AnswerButton(Button):
+    def __init__(self, answer_view: AnswerView, index: int, label: str):
+        super().__init__(emoji=label, style=discord.ButtonStyle.secondary)
+        self.answer_view = answer_view
+        self.index = index
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.answer_view.record(interaction, self.index)
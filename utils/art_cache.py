@@ -0,0 +1,219 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 art_cache.py — Illustrations transformées pour les modes de !illustration
+# Objectif : Télécharger une seule fois l’illustration d’une carte, la transformer
+#            avec Pillow (zoom, flou, révélation progressive) dans un pool de
+#            processus, et garder le résultat sur disque (cache LRU borné en taille)
+# Utilisation : bot.art_cache (créé dans bot.py, démarré avec la session HTTP)
+#               → images = await bot.art_cache.frames(card, "flou")   (JPEG en bytes)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.art_render import Image, MODES, render_art
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ART_DIR = os.path.join(ROOT_DIR, "data", "cache", "art")
+
+MAX_BYTES = 200 * 1024 * 1024   # 💾 Taille maximale du cache sur disque (200 Mo)
+RENDER_WORKERS = 2              # 🧮 Processus de rendu Pillow
+RECENT_MODE_TTL = 30 * 60       # ⏩ Seuls les modes demandés depuis 30 minutes sont rendus à l’avance
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 💾 Cache des illustrations
+# ────────────────────────────────────────────────────────────────────────────────
+class ArtCache:
+    """
+    💾 Fichiers <id>_source.jpg (illustration téléchargée) et <id>_<mode>_<n>.jpg
+    (images rendues) dans data/cache/art :
+    - l’ordre LRU est tenu en mémoire seulement (aucune écriture disque à la lecture),
+      et repart au démarrage de l’ordre d’écriture des fichiers ;
+    - au-delà de MAX_BYTES, les fichiers les moins récemment utilisés sont supprimés ;
+    - frames() renvoie le contenu des images, pas leurs chemins : une éviction
+      pendant l’envoi du message ne peut pas retirer un fichier encore à joindre ;
+    - un même rendu (ou téléchargement d’illustration) demandé deux fois en même
+      temps n’est fait qu’une fois.
+    """
+
+    def __init__(self, cache_dir: str = ART_DIR, max_bytes: int = MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.session = None           # 🌐 Session HTTP partagée du bot (fournie par start())
+        self._index = OrderedDict()   # nom de fichier -> taille, du moins au plus récent
+        self._size = 0
+        self._inflight = {}           # (card_id, mode) -> tâche de rendu
+        self._sources = {}            # card_id -> téléchargement de l’illustration en cours
+        self._requested = {}          # mode -> dernière demande par un joueur (monotonic)
+        self._executor = None
+
+    @property
+    def available(self) -> bool:
+        return self._executor is not None
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🗂️ Fichiers
+    # ────────────────────────────────────────────────────────────────────────────
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _load_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._size += size
+        self._evict()
+
+    def _touch(self, name: str):
+        self._index.move_to_end(name)
+
+    def _forget(self, name: str):
+        """Retire du cache un fichier disparu (supprimé à la main, éviction concurrente)."""
+        self._size -= self._index.pop(name, 0)
+
+    def _write(self, name: str, data: bytes):
+        tmp_path = self._path(name) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(name))
+
+    def _store(self, name: str, size: int):
+        self._size += size - self._index.pop(name, 0)
+        self._index[name] = size
+        self._evict()
+
+    def _evict(self):
+        while self._size > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._size -= size
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🖼️ Rendu
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _source(self, card) -> bytes:
+        """Illustration d’origine (téléchargée une seule fois)."""
+        name = f"{card.id}_source.jpg"
+        if name in self._index:
+            self._touch(name)
+            try:
+                return await asyncio.to_thread(self._read, name)
+            except OSError:
+                self._forget(name)
+
+        # 🔗 Plusieurs modes de la même carte rendus en même temps : un seul téléchargement
+        task = self._sources.get(card.id)
+        if task is None:
+            task = asyncio.create_task(self._download_source(card, name))
+            self._sources[card.id] = task
+            task.add_done_callback(lambda _: self._sources.pop(card.id, None))
+        return await task
+
+    async def _download_source(self, card, name: str) -> bytes:
+        async with self.session.get(card.image_url_cropped) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status} pour l’illustration de {card.id}")
+            raw = await resp.read()
+        await asyncio.to_thread(self._write, name, raw)
+        self._store(name, len(raw))
+        return raw
+
+    def _read(self, name: str) -> bytes:
+        with open(self._path(name), "rb") as f:
+            return f.read()
+
+    async def _render(self, card, mode: str) -> list:
+        raw = await self._source(card)
+        loop = asyncio.get_running_loop()
+        images = await loop.run_in_executor(self._executor, render_art, raw, mode, card.id)
+        for index, data in enumerate(images):
+            name = f"{card.id}_{mode}_{index}.jpg"
+            await asyncio.to_thread(self._write, name, data)
+            self._store(name, len(data))
+        return images
+
+    def _names(self, card, mode: str) -> list:
+        return [f"{card.id}_{mode}_{index}.jpg" for index in range(MODES[mode])]
+
+    async def frames(self, card, mode: str) -> list:
+        """Images JPEG du mode, en bytes (rendues si absentes du cache), pour une partie."""
+        self._requested[mode] = time.monotonic()
+        return await self._frames(card, mode)
+
+    async def _frames(self, card, mode: str) -> list:
+        names = self._names(card, mode)
+        if all(name in self._index for name in names):
+            for name in names:
+                self._touch(name)
+            try:
+                return await asyncio.to_thread(lambda: [self._read(name) for name in names])
+            except OSError:
+                for name in names:
+                    self._forget(name)  # 🔁 Évincé entre-temps : nouveau rendu
+
+        key = (card.id, mode)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(card, mode))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await task
+
+    def recent_modes(self) -> list:
+        """Modes joués depuis moins de RECENT_MODE_TTL (les seuls rendus à l’avance)."""
+        now = time.monotonic()
+        return [mode for mode, at in self._requested.items() if now - at < RECENT_MODE_TTL]
+
+    async def prerender(self, card):
+        """Rend à l’avance les modes joués récemment (réserve de manches de !illustration)."""
+        if not self.available or not card.image_url_cropped:
+            return
+        for mode in self.recent_modes():
+            if all(name in self._index for name in self._names(card, mode)):
+                continue  # ✅ Déjà en cache : rien à relire
+            try:
+                await self._frames(card, mode)
+            except Exception as e:
+                print(f"[ERREUR ART CACHE] {card.id} ({mode}) : {e}")
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ▶️ Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────────
+    def start(self, session):
+        self.session = session
+        if Image is None:
+            print("[ART CACHE] Pillow absent : modes de difficulté de !illustration désactivés.")
+            return
+        try:
+            self._load_index()
+        except OSError as e:
+            print(f"[ERREUR ART CACHE] {self.cache_dir} : {e}")
+            return
+        # 🧵 Pas de fork : le processus a déjà des threads (client Supabase, to_thread).
+        # Le serveur forkserver importe une fois Pillow et le module de rendu ; les
+        # processus de rendu (créés au premier rendu) en sont des copies.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["utils.art_render"])
+        self._executor = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=context)
+
+    def stop(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,63 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 art_render.py — Rendu Pillow des modes de difficulté de !illustration
+# Objectif : Fonctions exécutées dans les processus de rendu de utils/art_cache.py ;
+#            le module n’importe que Pillow, pour que les processus restent légers
+# Utilisation : images = render_art(raw, "flou", card_id)   (dans le pool de processus)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import io
+import random
+
+try:
+    from PIL import Image, ImageFilter
+except ImportError:  # 🖼️ Sans Pillow, seul le mode normal (URL de l’image) est proposé
+    Image = ImageFilter = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+JPEG_QUALITY = 85
+
+# 🎚️ Modes de difficulté → nombre d’images produites
+MODES = {
+    "zoom": 1,         # 🔍 Un fragment de l’illustration, agrandi
+    "flou": 1,         # 🌫️ Illustration floutée
+    "progressif": 3,   # 🧩 Pixelisée, de plus en plus nette pendant la manche
+}
+PIXEL_STEPS = (6, 12, 24)   # 🧩 Blocs en largeur de chaque étape du mode progressif
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖌️ Rendu (fonctions de module uniquement : appelées par le pool de processus)
+# ────────────────────────────────────────────────────────────────────────────────
+def _encode(img) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=JPEG_QUALITY)
+    return buffer.getvalue()
+
+def render_art(raw: bytes, mode: str, seed: int) -> list:
+    """Illustration brute → images JPEG du mode demandé."""
+    img = Image.open(io.BytesIO(raw)).convert("RGB")
+    width, height = img.size
+
+    if mode == "zoom":
+        # 🔍 Un tiers de l’image, toujours le même pour une carte donnée (cache)
+        rnd = random.Random(seed)
+        tile_w, tile_h = width // 3, height // 3
+        x = rnd.randint(0, width - tile_w)
+        y = rnd.randint(0, height - tile_h)
+        return [_encode(img.crop((x, y, x + tile_w, y + tile_h)).resize((width, height), Image.LANCZOS))]
+
+    if mode == "flou":
+        return [_encode(img.filter(ImageFilter.GaussianBlur(radius=max(width, height) / 40)))]
+
+    if mode == "progressif":
+        frames = []
+        for blocks in PIXEL_STEPS:
+            small = img.resize((blocks, max(1, blocks * height // width)), Image.BILINEAR)
+            frames.append(_encode(small.resize((width, height), Image.NEAREST)))
+        return frames
+
+    raise ValueError(f"Mode inconnu : {mode}")
@@ -0,0 +1,255 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 card_catalog.py — Catalogue partagé des cartes Yu-Gi-Oh!
+# Objectif : Télécharger une seule fois le dump YGOPRODeck et le rafraîchir en tâche de fond,
+#            uniquement quand la version de la base (checkDBVer.php) a changé
+# Utilisation : bot.card_catalog (créé dans bot.py, lu par tous les cogs)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import time
+import aiohttp
+from utils.card_store import CardStore
+from utils.card_search import CardNameIndex
+
+try:
+    import brotli  # noqa: F401 — si présent, aiohttp sait décoder le « br »
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+CARDINFO_URL = "https://db.ygoprodeck.com/api/v7/cardinfo.php"
+DBVER_URL = "https://db.ygoprodeck.com/api/v7/checkDBVer.php"
+DEFAULT_TTL = 60 * 60          # ⏳ Vérification de la version toutes les heures
+RETRY_DELAY = 5 * 60           # 🔁 Nouvel essai après 5 minutes en cas d’échec
+NAME_LANGUAGES = ("en", "de", "it", "pt")  # 🌍 Langues dont seuls les noms sont indexés
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAMES_CACHE = os.path.join(ROOT_DIR, "data", "cache", "card_names_{}.json")  # 💾 {id: nom} par langue
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Fonctions utilitaires (exécutées dans un thread)
+# ────────────────────────────────────────────────────────────────────────────────
+def _names_from_dump(body: bytes) -> dict:
+    """Dump cardinfo.php brut → {id: nom} (le reste du dump est libéré aussitôt)."""
+    data = json.loads(body)
+    return {card.get("id"): card.get("name", "") for card in data.get("data", [])}
+
+def _load_names(lang: str, version: str):
+    """Noms d’une langue gardés sur disque pour cette version de la base, sinon None."""
+    try:
+        with open(NAMES_CACHE.format(lang), encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("version") != version:
+        return None
+    return {int(card_id): name for card_id, name in cached.get("names", {}).items()}
+
+def _save_names(lang: str, version: str, names: dict):
+    path = NAMES_CACHE.format(lang)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": version, "names": names}, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📚 Catalogue des cartes
+# ────────────────────────────────────────────────────────────────────────────────
+class CardCatalog:
+    """
+    📚 Catalogue en mémoire de toutes les cartes (cardinfo.php), chargé une fois
+    puis rafraîchi en arrière-plan selon un TTL. Partagé par tous les cogs.
+    À chaque rafraîchissement, seule la version de la base est interrogée ; le dump
+    complet n’est retéléchargé (requête conditionnelle, compressée) que si elle change.
+    """
+
+    def __init__(self, language: str = "fr", ttl: int = DEFAULT_TTL):
+        self.language = language
+        self.ttl = ttl
+        self.store = CardStore([])  # 🃏 Cartes compactes (voir utils/card_store.py)
+        self.name_index = CardNameIndex()  # 🔍 Noms dans toutes les langues (voir utils/card_search.py)
+        self.loaded_at = 0.0     # 🕒 Horodatage (monotonic) de la dernière vérification réussie
+        self.db_version = None   # 🏷️ Version de la base YGOPRODeck des données en mémoire
+        self.etag = None         # 🔖 Validateurs HTTP du dernier dump reçu
+        self.last_modified = None
+        self.session = None      # 🌐 Session HTTP partagée du bot (fournie par start())
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    @property
+    def cards(self) -> list:
+        return self.store.cards
+
+    @property
+    def is_stale(self) -> bool:
+        """Vrai si le catalogue est vide ou plus vieux que le TTL."""
+        return not self.cards or time.monotonic() - self.loaded_at > self.ttl
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔍 Lecture
+    # ────────────────────────────────────────────────────────────────────────────
+    async def get_store(self) -> CardStore:
+        """Retourne le CardStore ; attend le premier chargement si le catalogue est vide."""
+        if not self.cards:
+            await self.refresh()
+        return self.store
+
+    async def get_cards(self) -> list:
+        """Retourne la liste des cartes compactes (objets Card)."""
+        return (await self.get_store()).cards
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔄 Chargement
+    # ────────────────────────────────────────────────────────────────────────────
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Vérifie la version de la base puis télécharge le dump complet si elle a changé.
+        Les appels concurrents attendent la même vérification. En cas d’échec,
+        les anciennes données sont conservées.
+        """
+        async with self._lock:
+            if not force and not self.is_stale:
+                return True
+
+            try:
+                version = await self._fetch_db_version(self.session)
+                if self.cards and version is not None and version == self.db_version:
+                    self.loaded_at = time.monotonic()
+                    return True
+                return await self._download(self.session, version)
+            except Exception as e:
+                print(f"[ERREUR CATALOGUE] {e}")
+                return False
+
+    async def _fetch_db_version(self, session):
+        """Retourne la version courante de la base YGOPRODeck (ou None si indisponible)."""
+        try:
+            async with session.get(DBVER_URL) as resp:
+                if resp.status != 200:
+                    return None
+                data = await resp.json()
+            return str(data[0].get("database_version")) if data else None
+        except Exception as e:
+            print(f"[CATALOGUE] Version de la base indisponible : {e}")
+            return None
+
+    async def _download(self, session, version) -> bool:
+        """Télécharge le dump complet (conditionnel si des validateurs sont connus)."""
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        if self.cards:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+
+        url = f"{CARDINFO_URL}?language={self.language}"
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                self.db_version = version or self.db_version
+                self.loaded_at = time.monotonic()
+                return True
+            if resp.status != 200:
+                print(f"[CATALOGUE] Réponse HTTP {resp.status} lors du chargement des cartes.")
+                return False
+            body = await resp.read()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+
+        # 🧵 Plusieurs Mo de JSON : analysés hors de la boucle asyncio (heartbeat de la gateway)
+        data = await asyncio.to_thread(json.loads, body)
+        del body
+        raw_cards = data.get("data", [])
+        if not raw_cards:
+            print("[CATALOGUE] Dump vide reçu, anciennes données conservées.")
+            return False
+
+        # 🗜️ Conversion immédiate (hors boucle asyncio) : les dicts bruts ne sont pas conservés
+        store = await asyncio.to_thread(CardStore.from_api, raw_cards)
+        del data, raw_cards
+
+        self.store = store
+        self.db_version = version
+        self.etag = etag
+        self.last_modified = last_modified
+        self.loaded_at = time.monotonic()
+        print(f"📚 Catalogue chargé : {len(store)} cartes ({self.language}, base v{version or '?'}).")
+
+        self.name_index = await self._build_name_index(session, store, version)
+        print(f"🔍 Index des noms prêt : {len(self.name_index)} noms.")
+        return True
+
+    async def _fetch_names(self, session, lang: str):
+        """{id: nom} d’une langue, téléchargé puis réduit dans un thread ; None si indisponible."""
+        # 🇬🇧 L’anglais est la langue par défaut de l’API (pas de paramètre)
+        url = CARDINFO_URL if lang == "en" else f"{CARDINFO_URL}?language={lang}"
+        try:
+            async with session.get(url, headers={"Accept-Encoding": ACCEPT_ENCODING}) as resp:
+                if resp.status != 200:
+                    print(f"[CATALOGUE] Noms {lang} indisponibles (HTTP {resp.status}).")
+                    return None
+                body = await resp.read()
+            # 🧵 Dump analysé et réduit à {id: nom} dans un thread : il n’est jamais gardé en entier
+            return await asyncio.to_thread(_names_from_dump, body)
+        except Exception as e:
+            print(f"[CATALOGUE] Noms {lang} indisponibles : {e}")
+            return None
+
+    async def _build_name_index(self, session, store, version) -> CardNameIndex:
+        """
+        Indexe les noms du catalogue + ceux des autres langues (seuls les noms sont gardés).
+        Les noms des autres langues sont gardés sur disque par version de la base : un
+        redémarrage sans nouvelle version ne retélécharge aucun dump.
+        """
+        names = [(card.id, card.name, self.language) for card in store]
+
+        for lang in NAME_LANGUAGES:
+            lang_names = await asyncio.to_thread(_load_names, lang, version) if version else None
+            if lang_names is None:
+                lang_names = await self._fetch_names(session, lang)
+                if lang_names is None:
+                    continue
+                if version:
+                    try:
+                        await asyncio.to_thread(_save_names, lang, version, lang_names)
+                    except OSError as e:
+                        print(f"[CATALOGUE] Noms {lang} non sauvegardés : {e}")
+            names.extend((card_id, name, lang) for card_id, name in lang_names.items())
+            del lang_names
+
+        def build():
+            index = CardNameIndex()
+            for card_id, name, lang in names:
+                index.add(card_id, name, lang)
+            return index
+
+        return await asyncio.to_thread(build)
+
+    async def _refresh_loop(self):
+        """Boucle de fond : premier chargement puis rafraîchissement selon le TTL."""
+        ok = await self.refresh()
+        while True:
+            await asyncio.sleep(self.ttl if ok else RETRY_DELAY)
+            ok = await self.refresh(force=True)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ▶️ Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────────
+    def start(self, session: aiohttp.ClientSession):
+        """Lance la tâche de rafraîchissement (à appeler depuis la boucle asyncio)."""
+        self.session = session
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    def stop(self):
+        """Arrête la tâche de rafraîchissement."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,104 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 card_search.py — Index local des noms de cartes (FR, EN, DE, IT, PT)
+# Objectif : Résoudre un nom de carte en identifiant sans appel réseau,
+#            avec tolérance aux fautes (trigrammes + score de similarité)
+# Utilisation : construit par CardCatalog (bot.card_catalog.name_index), lu par !carte
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import re
+import unicodedata
+from array import array
+from collections import namedtuple
+from difflib import SequenceMatcher
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+NameMatch = namedtuple("NameMatch", ["card_id", "lang", "name", "score"])
+
+MAX_CANDIDATES = 50   # 🎯 Candidats (par trigrammes communs) évalués finement
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae"})
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Fonctions utilitaires
+# ────────────────────────────────────────────────────────────────────────────────
+def normalize(text: str) -> str:
+    """Minuscules, accents retirés, ponctuation remplacée par des espaces."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    ascii_text = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", ascii_text.casefold().translate(_LIGATURES)).strip()
+
+def trigrams(norm: str) -> set:
+    """Trigrammes d’un nom normalisé (avec bordures pour les mots courts)."""
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔍 Index des noms
+# ────────────────────────────────────────────────────────────────────────────────
+class CardNameIndex:
+    """
+    🔍 Index en mémoire des noms de cartes dans plusieurs langues.
+    - lookup() : correspondance exacte (après normalisation), en O(1)
+    - search() : correspondances approchées, classées par similarité
+    """
+
+    def __init__(self):
+        self.exact = {}       # 🔑 nom normalisé -> NameMatch
+        self._entries = []    # 📋 (nom normalisé, card_id, langue, nom affiché)
+        self._postings = {}   # 🧩 trigramme -> array d’indices dans _entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, card_id, name: str, lang: str):
+        """Ajoute un nom ; les doublons (même nom normalisé, même carte) sont ignorés."""
+        norm = normalize(name)
+        if not norm:
+            return
+        existing = self.exact.get(norm)
+        if existing and existing.card_id == card_id:
+            return
+        if not existing:
+            self.exact[norm] = NameMatch(card_id, lang, name, 1.0)
+
+        position = len(self._entries)
+        self._entries.append((norm, card_id, lang, name))
+        for gram in trigrams(norm):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("I")
+            postings.append(position)
+
+    def lookup(self, query: str):
+        """Correspondance exacte (accents, casse et ponctuation ignorés) ou None."""
+        return self.exact.get(normalize(query))
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """Retourne jusqu’à `limit` cartes distinctes, de la plus proche à la moins proche."""
+        norm = normalize(query)
+        if not norm:
+            return []
+
+        # 🧮 Comptage des trigrammes communs pour présélectionner les candidats
+        counts = {}
+        for gram in trigrams(norm):
+            for position in self._postings.get(gram, ()):
+                counts[position] = counts.get(position, 0) + 1
+        if not counts:
+            return []
+        candidates = sorted(counts, key=counts.get, reverse=True)[:MAX_CANDIDATES]
+
+        # 🎯 Score fin (similarité de séquence) sur les meilleurs candidats
+        best = {}
+        for position in candidates:
+            entry_norm, card_id, lang, name = self._entries[position]
+            score = SequenceMatcher(None, norm, entry_norm).ratio()
+            if card_id not in best or score > best[card_id].score:
+                best[card_id] = NameMatch(card_id, lang, name, score)
+
+        return sorted(best.values(), key=lambda m: m.score, reverse=True)[:limit]
@@ -0,0 +1,158 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 card_store.py — Représentation compacte des cartes Yu-Gi-Oh!
+# Objectif : Remplacer les ~13k dicts JSON imbriqués par des enregistrements à __slots__
+# Utilisation : construit par CardCatalog, lu par les commandes (question, illustration…)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import random
+import sys
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+IMAGE_URL = "https://images.ygoprodeck.com/images/cards/{}.jpg"
+IMAGE_URL_CROPPED = "https://images.ygoprodeck.com/images/cards_cropped/{}.jpg"
+COMMON_RARITIES = ("Common", "")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Fonctions utilitaires
+# ────────────────────────────────────────────────────────────────────────────────
+def _intern(value):
+    """Interne les chaînes très répétées (type, race, attribut, archétype…)."""
+    return sys.intern(value) if isinstance(value, str) else None
+
+def display(value, default="—") -> str:
+    """Affichage d’un champ optionnel (0 est une valeur valide pour ATK/DEF)."""
+    return default if value is None else str(value)
+
+def card_family(card_type) -> str:
+    """Grande famille d’une carte : « monstre », « magie » ou « piège »."""
+    t = (card_type or "").lower()
+    return "monstre" if "monstre" in t else ("magie" if "magie" in t else "piège")
+
+def is_tcg(raw: dict) -> bool:
+    """Carte sortie en TCG (équivalent du filtre format=tcg de cardinfo.php)."""
+    formats = ((raw.get("misc_info") or [{}])[0]).get("formats")
+    if formats is not None:
+        return "TCG" in formats
+    return bool(raw.get("card_sets"))  # 📦 Sans misc_info : les éditions listées sont celles du TCG
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🃏 Carte compacte
+# ────────────────────────────────────────────────────────────────────────────────
+class Card:
+    """
+    🃏 Carte réduite aux champs utilisés par les commandes.
+    Les URLs d’images sont reconstruites à partir de l’identifiant d’illustration.
+    """
+    __slots__ = (
+        "id", "name", "desc", "type", "race", "attribute", "archetype",
+        "atk", "defense", "level", "ban_tcg", "image_id", "has_cropped", "only_common", "tcg",
+    )
+
+    def __init__(self, id, name, desc, type=None, race=None, attribute=None, archetype=None,
+                 atk=None, defense=None, level=None, ban_tcg=None, image_id=None,
+                 has_cropped=False, only_common=True, tcg=True):
+        self.id = id
+        self.name = name
+        self.desc = desc
+        self.type = _intern(type)
+        self.race = _intern(race)
+        self.attribute = _intern(attribute)
+        self.archetype = _intern(archetype)
+        self.atk = atk
+        self.defense = defense
+        self.level = level
+        self.ban_tcg = _intern(ban_tcg)
+        self.image_id = image_id
+        self.has_cropped = has_cropped
+        self.only_common = only_common
+        self.tcg = tcg
+
+    @classmethod
+    def from_api(cls, raw: dict) -> "Card":
+        """Construit une carte à partir d’une entrée brute de cardinfo.php."""
+        images = raw.get("card_images") or [{}]
+        image = images[0]
+        return cls(
+            id=raw.get("id"),
+            name=raw.get("name", ""),
+            desc=raw.get("desc", ""),
+            type=raw.get("type"),
+            race=raw.get("race"),
+            attribute=raw.get("attribute"),
+            archetype=raw.get("archetype"),
+            atk=raw.get("atk"),
+            defense=raw.get("def"),
+            level=raw.get("level"),
+            ban_tcg=(raw.get("banlist_info") or {}).get("ban_tcg"),
+            image_id=image.get("id", raw.get("id")),
+            has_cropped="image_url_cropped" in image,
+            only_common=all(s.get("rarity", "") in COMMON_RARITIES for s in raw.get("card_sets") or []),
+            tcg=is_tcg(raw),
+        )
+
+    @property
+    def image_url(self):
+        return IMAGE_URL.format(self.image_id) if self.image_id is not None else None
+
+    @property
+    def image_url_cropped(self):
+        return IMAGE_URL_CROPPED.format(self.image_id) if self.has_cropped else None
+
+    @property
+    def is_monster(self) -> bool:
+        return bool(self.type) and self.type.lower().startswith("monstre")
+
+    def __repr__(self):
+        return f"<Card {self.id} {self.name!r}>"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📚 Ensemble de cartes
+# ────────────────────────────────────────────────────────────────────────────────
+class CardStore:
+    """
+    📚 Liste de cartes compactes + index secondaires construits une fois par chargement
+    (identifiant, archétype, type exact sans archétype, famille, illustration croppée),
+    pour choisir une carte et ses leurres sans parcourir tout le catalogue.
+    """
+
+    def __init__(self, cards: list):
+        self.cards = cards
+        self.by_id = {}
+        self.by_archetype = {}
+        self.by_type_no_archetype = {}
+        self.by_family = {}
+        self.with_cropped = []
+
+        for card in cards:
+            self.by_id[card.id] = card
+            if card.archetype:
+                self.by_archetype.setdefault(card.archetype, []).append(card)
+            else:
+                self.by_type_no_archetype.setdefault(card.type, []).append(card)
+            self.by_family.setdefault(card_family(card.type), []).append(card)
+            if card.has_cropped:
+                self.with_cropped.append(card)
+
+    @classmethod
+    def from_api(cls, raw_cards: list) -> "CardStore":
+        return cls([Card.from_api(raw) for raw in raw_cards])
+
+    def get(self, card_id):
+        return self.by_id.get(card_id)
+
+    @staticmethod
+    def sample_distractors(group: list, card: Card, k: int = 3) -> list:
+        """Tire jusqu’à k cartes de group dont le nom diffère de celui de card."""
+        picks = random.sample(group, min(k + 1, len(group)))
+        return [c for c in picks if c.name != card.name][:k]
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
@@ -0,0 +1,220 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 database.py — Accès asynchrone à Supabase
+# Objectif : Ne plus appeler le client Supabase synchrone depuis la boucle asyncio ;
+#            chaque requête s’exécute dans un pool de threads borné
+# Utilisation : from utils.database import db  →  await db.get_streak(user_id)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from supabase_client import supabase
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+DB_WORKERS = 4  # 🧵 Requêtes Supabase simultanées au maximum
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Couche d’accès aux données
+# ────────────────────────────────────────────────────────────────────────────────
+class Database:
+    """
+    🗄️ Méthodes asynchrones typées pour les tables du bot
+    (ygo_streaks, bot_lock, tournoi_info, rappels_tournoi, rappel_jobs, rappels_envois).
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="supabase")
+
+    async def _execute(self, query):
+        """Exécute une requête postgrest (query.execute()) hors de la boucle asyncio."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, query.execute)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔐 Verrou d’instance (bot_lock)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def force_lock(self, instance_id: str, updated_at: str):
+        """Attribue le verrou à cette instance, quel que soit son propriétaire actuel."""
+        await self._execute(self.client.table("bot_lock").upsert({
+            "id": "bot_lock",
+            "instance_id": instance_id,
+            "updated_at": updated_at
+        }))
+
+    async def get_lock_owner(self) -> Optional[str]:
+        """Identifiant de l’instance qui détient le verrou (ou None)."""
+        response = await self._execute(
+            self.client.table("bot_lock").select("instance_id").eq("id", "bot_lock")
+        )
+        return response.data[0].get("instance_id") if response.data else None
+
+    async def renew_lock(self, instance_id: str, updated_at: str) -> bool:
+        """Prolonge le bail si cette instance le détient encore ; False sinon."""
+        response = await self._execute(
+            self.client.table("bot_lock")
+            .update({"updated_at": updated_at})
+            .eq("id", "bot_lock")
+            .eq("instance_id", instance_id)
+        )
+        return bool(response.data)
+
+    async def take_expired_lock(self, instance_id: str, updated_at: str, expired_before: str) -> bool:
+        """Prend le verrou seulement si son dernier renouvellement est antérieur à expired_before."""
+        response = await self._execute(
+            self.client.table("bot_lock")
+            .update({"instance_id": instance_id, "updated_at": updated_at})
+            .eq("id", "bot_lock")
+            .lt("updated_at", expired_before)
+        )
+        return bool(response.data)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔥 Séries de bonnes réponses (ygo_streaks)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def get_streak(self, user_id) -> Optional[dict]:
+        """Ligne complète de ygo_streaks pour l’utilisateur (ou None)."""
+        response = await self._execute(
+            self.client.table("ygo_streaks").select("*").eq("user_id", user_id)
+        )
+        return response.data[0] if response.data else None
+
+    async def get_streaks(self, user_ids, batch_id: str = None) -> tuple:
+        """
+        Lignes de ygo_streaks de plusieurs utilisateurs en une requête (fonction
+        read_streaks) : ({user_id: ligne}, True si le lot batch_id y est déjà appliqué).
+        """
+        user_ids = [str(uid) for uid in user_ids]
+        if not user_ids:
+            return {}, False
+        response = await self._execute(
+            self.client.rpc("read_streaks", {"p_user_ids": user_ids, "p_batch_id": batch_id})
+        )
+        data = response.data or {}
+        return {row["user_id"]: row for row in data.get("rows") or []}, bool(data.get("applied"))
+
+    async def apply_streak_deltas(self, batch_id: str, deltas: list) -> list:
+        """
+        Applique un lot de deltas de séries de façon atomique côté serveur
+        (fonction apply_streak_deltas, sql/ygo_streaks.sql). Un lot déjà appliqué
+        (même batch_id) est ignoré. Retourne les lignes à jour des joueurs concernés.
+        """
+        response = await self._execute(
+            self.client.rpc("apply_streak_deltas", {"p_batch_id": batch_id, "p_deltas": deltas})
+        )
+        return response.data or []
+
+    async def top_streaks(self, column: str = "best_streak", limit: int = 10) -> list:
+        """Lignes (user_id, column) triées par column décroissant (valeurs nulles ou à 0 exclues)."""
+        response = await self._execute(
+            self.client.table("ygo_streaks")
+            .select(f"user_id, {column}")
+            .gt(column, 0)
+            .order(column, desc=True)
+            .limit(limit)
+        )
+        return response.data or []
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📅 Tournoi (tournoi_info)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def get_tournoi_info(self) -> Optional[dict]:
+        """Dernière ligne de tournoi_info (ou None)."""
+        response = await self._execute(
+            self.client.table("tournoi_info").select("prochaine_date").order("id", desc=True).limit(1)
+        )
+        return response.data[0] if response.data else None
+
+    async def set_tournoi_date(self, iso_date: str) -> list:
+        """Enregistre la date du prochain tournoi ; retourne les lignes modifiées."""
+        response = await self._execute(
+            self.client.table("tournoi_info").update({"prochaine_date": iso_date}).eq("id", 1)
+        )
+        return response.data or []
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🛎️ Rappels de tournoi (rappels_tournoi)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def add_rappel(self, user_id) -> bool:
+        """Inscrit l’utilisateur en une requête ; False s’il l’était déjà."""
+        response = await self._execute(
+            self.client.table("rappels_tournoi")
+            .upsert({"user_id": str(user_id)}, on_conflict="user_id", ignore_duplicates=True)
+        )
+        return bool(response.data)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ⏰ Échéances des rappels (rappel_jobs)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def ensure_rappel_jobs(self, jobs: list):
+        """Crée les échéances manquantes (celles qui existent déjà sont laissées telles quelles)."""
+        await self._execute(
+            self.client.table("rappel_jobs")
+            .upsert(jobs, on_conflict="tournoi_date,offset_key", ignore_duplicates=True)
+        )
+
+    async def pending_rappel_jobs(self) -> list:
+        """Échéances pas encore traitées."""
+        response = await self._execute(
+            self.client.table("rappel_jobs").select("*").is_("done_at", "null").order("fire_at")
+        )
+        return response.data or []
+
+    async def finish_rappel_job(self, job: dict, done_at: str):
+        await self._execute(
+            self.client.table("rappel_jobs")
+            .update({"done_at": done_at})
+            .eq("tournoi_date", job["tournoi_date"])
+            .eq("offset_key", job["offset_key"])
+        )
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📨 File d’envoi des rappels (rappels_envois)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def enqueue_rappels(self, tournoi_date: str, offset_key: str, final: bool) -> int:
+        """Met en file un MP par inscrit pour cette échéance (fonction enqueue_rappels)."""
+        response = await self._execute(self.client.rpc("enqueue_rappels", {
+            "p_tournoi_date": tournoi_date, "p_offset": offset_key, "p_final": final
+        }))
+        return response.data or 0
+
+    async def claim_rappels(self, instance_id: str, limit: int) -> list:
+        """Réserve jusqu’à `limit` MP à envoyer (fonction claim_rappels, sql/rappels_tournoi.sql)."""
+        response = await self._execute(
+            self.client.rpc("claim_rappels", {"p_instance": instance_id, "p_limit": limit})
+        )
+        return response.data or []
+
+    async def delete_rappel(self, row: dict):
+        """Supprime un MP envoyé de la file."""
+        await self._execute(
+            self.client.table("rappels_envois").delete()
+            .eq("user_id", row["user_id"])
+            .eq("tournoi_date", row["tournoi_date"])
+            .eq("offset_key", row["offset_key"])
+        )
+
+    async def purge_rappels(self, before: str):
+        """Supprime les MP des tournois déjà commencés (abandonnés ou devenus inutiles)."""
+        await self._execute(
+            self.client.table("rappels_envois").delete().lte("tournoi_date", before)
+        )
+
+    async def release_rappel(self, row: dict, attempts: int):
+        """Remet un MP non envoyé en file (claimed_at est gardé : délai avant nouvel essai)."""
+        await self._execute(
+            self.client.table("rappels_envois")
+            .update({"claimed_by": None, "attempts": attempts})
+            .eq("user_id", row["user_id"])
+            .eq("tournoi_date", row["tournoi_date"])
+            .eq("offset_key", row["offset_key"])
+        )
+
+# 🔌 Instance partagée, comme le client supabase de supabase_client.py
+db = Database(supabase)
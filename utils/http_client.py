@@ -0,0 +1,35 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 http_client.py — Session HTTP partagée par tout le bot
+# Objectif : Réutiliser les connexions (keep-alive, TLS, DNS) vers YGOPRODeck et Supabase
+# Utilisation : bot.http_session (créée dans bot.py, fermée à l’arrêt du bot)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import aiohttp
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+MAX_CONNECTIONS = 100          # 🔌 Connexions simultanées, tous hôtes confondus
+MAX_CONNECTIONS_PER_HOST = 20  # 🔌 Connexions simultanées par hôte
+DNS_CACHE_TTL = 300            # 🧭 Résolutions DNS gardées 5 minutes
+KEEPALIVE_TIMEOUT = 60         # ♻️ Connexions inactives gardées 1 minute
+
+# ⏱️ Pas de limite globale (le dump complet des cartes peut être long à télécharger),
+# mais une connexion ou une lecture bloquée ne peut pas durer indéfiniment.
+TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10, sock_connect=10, sock_read=30)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏭 Création de la session
+# ────────────────────────────────────────────────────────────────────────────────
+def create_http_session() -> aiohttp.ClientSession:
+    """Crée la session aiohttp partagée (à appeler depuis la boucle asyncio)."""
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=TIMEOUT)
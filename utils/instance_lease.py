@@ -0,0 +1,111 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 instance_lease.py — Élection de l’instance principale par bail (bot_lock)
+# Objectif : Une seule instance répond aux messages ; le verrou est pris avec une
+#            durée de validité, renouvelé régulièrement, et la réponse « suis-je
+#            l’instance principale ? » reste en mémoire (bot.is_main_instance)
+# Utilisation : bot.instance_lease (créé dans bot.py, démarré dans on_ready)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from utils.database import db
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+LEASE_TTL = 60            # ⏳ Durée de validité du bail (secondes)
+HEARTBEAT_INTERVAL = 20   # 💓 Renouvellement / tentative de prise (secondes)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔐 Bail d’instance
+# ────────────────────────────────────────────────────────────────────────────────
+class InstanceLease:
+    """
+    🔐 Verrou à durée limitée sur la ligne bot_lock :
+    - au démarrage, la nouvelle instance prend le verrou de force (comme avant) ;
+    - l’instance principale le renouvelle toutes les HEARTBEAT_INTERVAL secondes ;
+      si une autre instance l’a pris, ou si le bail local expire faute de
+      renouvellement réussi, elle se retire ;
+    - une instance secondaire ne reprend le verrou que s’il n’a plus été
+      renouvelé depuis LEASE_TTL secondes.
+    """
+
+    def __init__(self, bot, instance_id: str, ttl: float = LEASE_TTL, interval: float = HEARTBEAT_INTERVAL):
+        self.bot = bot
+        self.instance_id = instance_id
+        self.ttl = ttl
+        self.interval = interval
+        self.expires_at = 0.0   # ⏱️ Fin du bail local (time.monotonic)
+        self.decided = asyncio.Event()  # ✅ Levé après la première tentative de prise du verrou
+        self._task = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔁 Changement d’état
+    # ────────────────────────────────────────────────────────────────────────────
+    def _set_leader(self, leader: bool):
+        if leader:
+            self.expires_at = time.monotonic() + self.ttl
+        if leader != self.bot.is_main_instance:
+            state = "principale" if leader else "secondaire"
+            print(f"🔐 Cette instance ({self.instance_id}) devient {state}.")
+        self.bot.is_main_instance = leader
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 💓 Battement de cœur
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _beat(self):
+        now = datetime.now(timezone.utc)
+        if self.bot.is_main_instance:
+            renewed = await db.renew_lock(self.instance_id, now.isoformat())
+            if not renewed:
+                print("🔐 Verrou repris par une autre instance.")
+            self._set_leader(renewed)
+        else:
+            expired_before = (now - timedelta(seconds=self.ttl)).isoformat()
+            self._set_leader(await db.take_expired_lock(self.instance_id, now.isoformat(), expired_before))
+
+    async def _run(self):
+        try:
+            await asyncio.wait_for(
+                db.force_lock(self.instance_id, datetime.now(timezone.utc).isoformat()),
+                timeout=self.interval,
+            )
+            print(f"🔐 Verrou mis à jour pour cette instance : {self.instance_id}")
+            self._set_leader(True)
+        except Exception as e:
+            print(f"❌ Erreur lors de la mise à jour du verrou : {e}")
+            self._set_leader(False)
+        self.decided.set()
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.wait_for(self._beat(), timeout=self.interval)
+            except Exception as e:
+                print(f"[ERREUR LOCK] Renouvellement impossible : {e}")
+                # 🕰️ Sans renouvellement, on ne reste principal que jusqu’à la fin du bail
+                if self.bot.is_main_instance and time.monotonic() >= self.expires_at:
+                    print("🔐 Bail expiré sans renouvellement.")
+                    self._set_leader(False)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ▶️ Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────────
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.bot.is_main_instance = False
@@ -0,0 +1,238 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 interaction_dispatcher.py — Routage des réactions par message
+# Objectif : Remplacer les bot.wait_for("reaction_add", check=...) des commandes :
+#            discord.py évalue chaque prédicat en attente à chaque réaction reçue,
+#            alors qu’ici un seul listener retrouve la session par l’id du message
+#            (dictionnaire) et les délais sont gérés par une roue de minuteurs
+# Utilisation : bot.interactions (créé dans bot.py)
+#               → session = bot.interactions.session(message.id, timeout=30, emojis=...)
+#                 payload = await session.next()   (asyncio.TimeoutError à expiration)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import inspect
+import math
+
+import discord
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+WHEEL_TICK = 0.25    # ⏱️ Précision des délais (secondes)
+WHEEL_SLOTS = 512    # 🎡 Cases de la roue (un tour = 128 secondes)
+
+_EXPIRED = object()  # 🔚 Marqueur de fin de session dans la file
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎡 Roue de minuteurs
+# ────────────────────────────────────────────────────────────────────────────────
+class TimerWheel:
+    """
+    🎡 Roue de minuteurs hachée : ajout et annulation en O(1), une seule tâche
+    qui avance d’une case par WHEEL_TICK (et seulement s’il reste des minuteurs).
+    Un délai plus long qu’un tour de roue attend le nombre de tours nécessaire.
+    """
+
+    def __init__(self, tick: float = WHEEL_TICK, slots: int = WHEEL_SLOTS):
+        self.tick = tick
+        self.slots = [dict() for _ in range(slots)]   # timer_id -> [tours restants, callback]
+        self.cursor = 0
+        self.count = 0
+        self._where = {}        # timer_id -> case
+        self._next_id = 0
+        self._task = None
+
+    def schedule(self, delay: float, callback) -> int:
+        """Appelle callback() dans `delay` secondes ; retourne l’identifiant du minuteur."""
+        ticks = max(1, math.ceil(delay / self.tick))
+        rounds, offset = divmod(ticks, len(self.slots))
+        if offset == 0:
+            rounds, offset = rounds - 1, len(self.slots)
+        slot = (self.cursor + offset) % len(self.slots)
+
+        self._next_id += 1
+        self.slots[slot][self._next_id] = [rounds, callback]
+        self._where[self._next_id] = slot
+        self.count += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._next_id
+
+    def cancel(self, timer_id):
+        slot = self._where.pop(timer_id, None)
+        if slot is not None:
+            del self.slots[slot][timer_id]
+            self.count -= 1
+
+    def _advance(self):
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        bucket = self.slots[self.cursor]
+        fired = []
+        for timer_id, entry in bucket.items():
+            if entry[0] > 0:
+                entry[0] -= 1
+            else:
+                fired.append(timer_id)
+        for timer_id in fired:
+            _, callback = bucket.pop(timer_id)
+            del self._where[timer_id]
+            self.count -= 1
+            try:
+                callback()
+            except Exception as e:
+                print(f"[ERREUR DISPATCHER] Minuteur : {e}")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick
+        try:
+            while self.count:
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+                # ⏩ Rattrape les cases sautées si la boucle a été bloquée
+                while next_tick <= loop.time() and self.count:
+                    self._advance()
+                    next_tick += self.tick
+        finally:
+            self._task = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧭 Routes et sessions
+# ────────────────────────────────────────────────────────────────────────────────
+class Route:
+    """Abonnement d’un message : handler(payload) pour chaque réaction acceptée."""
+
+    __slots__ = ("message_id", "handler", "emojis", "user_id", "on_expire", "timer")
+
+    def __init__(self, message_id, handler, emojis=None, user_id=None, on_expire=None):
+        self.message_id = message_id
+        self.handler = handler
+        self.emojis = set(emojis) if emojis else None
+        self.user_id = user_id
+        self.on_expire = on_expire
+        self.timer = None
+
+class Session:
+    """
+    ⏳ Attente des événements d’un message, façon wait_for :
+    payload = await session.next() ; asyncio.TimeoutError quand le délai est écoulé.
+    """
+
+    def __init__(self, dispatcher, message_id, timeout, emojis=None, user_id=None):
+        self.dispatcher = dispatcher
+        self.queue = asyncio.Queue()
+        self.route = dispatcher.add(
+            message_id, self.queue.put_nowait,
+            emojis=emojis, user_id=user_id, timeout=timeout,
+            on_expire=lambda: self.queue.put_nowait(_EXPIRED),
+        )
+
+    async def next(self):
+        """Prochaine réaction (RawReactionActionEvent)."""
+        event = await self.queue.get()
+        if event is _EXPIRED:
+            raise asyncio.TimeoutError
+        return event
+
+    def touch(self, timeout: float):
+        """Repousse l’expiration (délai d’inactivité)."""
+        self.dispatcher.touch(self.route, timeout)
+
+    def close(self):
+        self.dispatcher.remove(self.route)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧭 Dispatcher
+# ────────────────────────────────────────────────────────────────────────────────
+class InteractionDispatcher:
+    """
+    🧭 Un seul listener pour on_raw_reaction_add (les boutons passent par les
+    vues discord.py, voir utils/answer_view.py) :
+    - routes : message_id -> Route (recherche en O(1), quel que soit le nombre de parties) ;
+    - filtres par emoji et par joueur appliqués avant d’appeler le handler ;
+    - réactions des bots (dont celles ajoutées par le bot lui-même) ignorées ;
+    - expiration explicite par la roue de minuteurs (route retirée, on_expire()).
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.routes = {}
+        self.wheel = TimerWheel()
+        self._background = set()
+
+        bot.add_listener(self._on_raw_reaction_add, "on_raw_reaction_add")
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📝 Abonnements
+    # ────────────────────────────────────────────────────────────────────────────
+    def add(self, message_id, handler, *, emojis=None, user_id=None, timeout=None, on_expire=None) -> Route:
+        """Abonne handler aux événements du message ; sans timeout, jusqu’à remove()."""
+        old = self.routes.get(message_id)
+        if old:
+            self.remove(old)
+        route = Route(message_id, handler, emojis, user_id, on_expire)
+        self.routes[message_id] = route
+        if timeout is not None:
+            self.touch(route, timeout)
+        return route
+
+    def session(self, message_id, *, timeout: float, emojis=None, user_id=None) -> Session:
+        return Session(self, message_id, timeout, emojis, user_id)
+
+    def touch(self, route: Route, timeout: float):
+        if route.timer is not None:
+            self.wheel.cancel(route.timer)
+        route.timer = self.wheel.schedule(timeout, lambda: self._expire(route))
+
+    def remove(self, route: Route):
+        if route.timer is not None:
+            self.wheel.cancel(route.timer)
+            route.timer = None
+        if self.routes.get(route.message_id) is route:
+            del self.routes[route.message_id]
+
+    def discard(self, message_id):
+        """Retire l’abonnement du message s’il existe."""
+        route = self.routes.get(message_id)
+        if route:
+            self.remove(route)
+
+    def _expire(self, route: Route):
+        route.timer = None
+        self.remove(route)
+        if route.on_expire:
+            route.on_expire()
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📡 Événements gateway
+    # ────────────────────────────────────────────────────────────────────────────
+    def _call(self, route: Route, event):
+        try:
+            result = route.handler(event)
+        except Exception as e:
+            print(f"[ERREUR DISPATCHER] {route.message_id} : {e}")
+            return
+        if inspect.isawaitable(result):
+            task = asyncio.create_task(result)
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        route = self.routes.get(payload.message_id)
+        if route is None:
+            return
+        if payload.user_id == self.bot.user.id or (payload.member and payload.member.bot):
+            return
+        if route.user_id is not None and payload.user_id != route.user_id:
+            return
+        if route.emojis is not None and str(payload.emoji) not in route.emojis:
+            return
+        self._call(route, payload)
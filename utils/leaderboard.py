@@ -0,0 +1,133 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 leaderboard.py — Classements des meilleures séries, tenus en mémoire
+# Objectif : Répondre à !questionscoretop / !illustrationscoretop sans requête
+#            Supabase : les classements sont chargés une fois, puis mis à jour
+#            avec les lignes renvoyées par chaque envoi du tampon des séries
+# Utilisation : bot.leaderboard (créé dans bot.py) → bot.leaderboard.boards["question"]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+from bisect import bisect_left, insort
+
+from utils.database import db
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+BOARD_SIZE = 1000   # 🏅 Joueurs gardés par classement (suffisant pour filtrer par serveur)
+RETRY_DELAY = 60    # 🔁 Nouvel essai de chargement après 1 minute en cas d’échec
+READY_TIMEOUT = 10  # ⏳ Attente maximale du premier chargement par une commande
+
+# 🎮 Classement -> colonne de ygo_streaks
+BOARD_COLUMNS = {
+    "question": "best_streak",
+    "illu": "best_illustreak",
+}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏅 Un classement
+# ────────────────────────────────────────────────────────────────────────────────
+class Board:
+    """
+    🏅 Top-K d’une colonne : scores par joueur + liste triée de (-score, user_id),
+    maintenue par insertion dichotomique à chaque changement de score.
+    """
+
+    def __init__(self, column: str, size: int = BOARD_SIZE):
+        self.column = column
+        self.size = size
+        self.scores = {}     # user_id -> score
+        self._ranking = []   # (-score, user_id), du meilleur au moins bon
+
+    def __len__(self):
+        return len(self._ranking)
+
+    def set(self, user_id: str, score: int):
+        old = self.scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            del self._ranking[bisect_left(self._ranking, (-old, user_id))]
+            del self.scores[user_id]
+        if not score or score <= 0:
+            return
+
+        entry = (-score, user_id)
+        if len(self._ranking) >= self.size and entry > self._ranking[-1]:
+            return  # 📉 Hors du top-K
+        insort(self._ranking, entry)
+        self.scores[user_id] = score
+        if len(self._ranking) > self.size:
+            _, dropped = self._ranking.pop()
+            del self.scores[dropped]
+
+    def entries(self, keep=None) -> list:
+        """[(rang, user_id, score)] ; keep(user_id) filtre les joueurs (ex. membres d’un serveur)."""
+        result = []
+        for neg_score, user_id in self._ranking:
+            if keep is None or keep(user_id):
+                result.append((len(result) + 1, user_id, -neg_score))
+        return result
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏆 Service des classements
+# ────────────────────────────────────────────────────────────────────────────────
+class Leaderboard:
+    """
+    🏆 Un Board par jeu. Chargé au démarrage depuis Supabase, puis tenu à jour
+    par les lignes que renvoie chaque envoi de bot.streak_buffer.
+    """
+
+    def __init__(self, size: int = BOARD_SIZE):
+        self.boards = {name: Board(column, size) for name, column in BOARD_COLUMNS.items()}
+        self._loaded = asyncio.Event()
+        self._task = None
+
+    async def wait_ready(self, timeout: float = READY_TIMEOUT) -> bool:
+        """Attend le premier chargement (au démarrage du bot) ; False si toujours pas chargé."""
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def update(self, rows: list):
+        """Met à jour les classements avec des lignes ygo_streaks (écouteur du tampon)."""
+        for row in rows:
+            user_id = str(row.get("user_id"))
+            for board in self.boards.values():
+                if board.column in row:
+                    board.set(user_id, row[board.column] or 0)
+
+    async def _load(self):
+        while True:
+            try:
+                for board in self.boards.values():
+                    rows = await db.top_streaks(board.column, limit=board.size)
+                    for row in rows:
+                        # Un envoi du tampon a pu passer pendant le chargement : on garde le plus haut
+                        user_id = str(row["user_id"])
+                        board.set(user_id, max(row.get(board.column) or 0, board.scores.get(user_id, 0)))
+                self._loaded.set()
+                print("🏆 Classements chargés : " + ", ".join(f"{n} ({len(b)})" for n, b in self.boards.items()))
+                return
+            except Exception as e:
+                print(f"[ERREUR CLASSEMENT] {e}")
+                await asyncio.sleep(RETRY_DELAY)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ▶️ Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────────
+    def start(self, streak_buffer):
+        """S’abonne aux envois du tampon puis charge les classements en tâche de fond."""
+        streak_buffer.listeners.append(self.update)
+        if self._task is None:
+            self._task = asyncio.create_task(self._load())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
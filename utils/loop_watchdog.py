@@ -0,0 +1,152 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 loop_watchdog.py — Surveillance des blocages de la boucle asyncio
+# Objectif : Mesurer en continu le retard (lag) de la boucle et, quand un callback
+#            la bloque trop longtemps, capturer sa pile d’appels et la commande en cours
+# Utilisation : bot.loop_watchdog (créé dans bot.py) ; compteurs affichés par !ping
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+PROBE_INTERVAL = 0.25    # ⏱️ Période de la sonde dans la boucle (secondes)
+STALL_THRESHOLD = 0.5    # 🚨 Blocage signalé au-delà de ce retard (secondes)
+STACK_DEPTH = 12         # 📜 Nombre de frames gardées dans le rapport
+BLAME_DIRS = ("commands", "tasks", "utils")  # 🎯 Dossiers du bot à incriminer en priorité
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🐕 Chien de garde
+# ────────────────────────────────────────────────────────────────────────────────
+class LoopWatchdog:
+    """
+    🐕 Deux mécanismes complémentaires :
+    - une sonde asyncio qui dort PROBE_INTERVAL et mesure son retard au réveil ;
+    - un thread qui, si la sonde ne s’est pas réveillée à temps, capture la pile
+      du thread de la boucle pour savoir quel code la bloque.
+    """
+
+    def __init__(self, probe_interval: float = PROBE_INTERVAL, threshold: float = STALL_THRESHOLD):
+        self.probe_interval = probe_interval
+        self.threshold = threshold
+
+        # 📊 Compteurs exposés (voir stats())
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.blame_counts = Counter()
+
+        self._heartbeat = time.monotonic()
+        self._snapshot = None     # (responsable, commandes, pile) capturé pendant le blocage en cours
+        self._inflight = {}       # message_id -> (nom de commande, cog, début)
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📊 Lecture des compteurs
+    # ────────────────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        return {
+            "last_lag_ms": round(self.last_lag * 1000),
+            "max_lag_ms": round(self.max_lag * 1000),
+            "stalls": self.stalls,
+            "top_blame": self.blame_counts.most_common(3),
+        }
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🧭 Suivi des commandes en cours
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _on_command(self, ctx):
+        cog = ctx.cog.qualified_name if ctx.cog else "?"
+        self._inflight[ctx.message.id] = (ctx.command.qualified_name, cog, time.monotonic())
+
+    async def _on_command_done(self, ctx, *args):
+        self._inflight.pop(ctx.message.id, None)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔍 Sonde asyncio
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _probe(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.probe_interval)
+            now = time.monotonic()
+            self._heartbeat = now
+
+            lag = max(0.0, now - start - self.probe_interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+
+            if lag >= self.threshold:
+                blame, running, stack = self._snapshot or ("inconnu", "", "(pile non capturée)\n")
+                self.stalls += 1
+                self.blame_counts[blame] += 1
+                print(
+                    f"[WATCHDOG] ⚠️ Boucle asyncio bloquée {lag * 1000:.0f} ms — responsable : {blame}{running}\n{stack}"
+                )
+            self._snapshot = None
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🧵 Thread de surveillance
+    # ────────────────────────────────────────────────────────────────────────────
+    def _watch(self):
+        while not self._stopped.wait(self.probe_interval / 2):
+            overdue = time.monotonic() - self._heartbeat - self.probe_interval
+            if overdue < self.threshold or self._snapshot is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._snapshot = self._describe(traceback.extract_stack(frame))
+
+    def _describe(self, stack):
+        """Retourne (responsable, commandes en cours, pile formatée) pour la pile de la boucle."""
+        blame = None
+        for entry in reversed(stack):
+            rel = os.path.relpath(entry.filename, ROOT_DIR)
+            if rel.split(os.sep)[0] in BLAME_DIRS:
+                blame = f"{rel} ({entry.name})"
+                break
+
+        running = [f"!{name} ({cog})" for name, cog, _ in self._inflight.values()]
+        if blame is None:
+            blame = running[0] if len(running) == 1 else "inconnu"
+        running_text = f" — commandes en cours : {', '.join(running)}" if running else ""
+
+        formatted = "".join(traceback.format_list(stack[-STACK_DEPTH:]))
+        return blame, running_text, formatted
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ▶️ Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────────
+    def start(self, bot):
+        """Démarre la sonde et le thread (à appeler depuis la boucle asyncio)."""
+        bot.add_listener(self._on_command, "on_command")
+        bot.add_listener(self._on_command_done, "on_command_completion")
+        bot.add_listener(self._on_command_done, "on_command_error")
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._probe())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,174 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 outbound.py — File d’envoi vers Discord par salon (éditions fusionnées)
+# Objectif : Ne pas épuiser la limite de débit d’un salon avec des mises à jour
+#            cosmétiques : les éditions successives d’un même message sont fusionnées
+#            (seul le dernier état part), les réponses passent avant le cosmétique,
+#            et la saturation de chaque salon est mesurée (!ping)
+# Utilisation : bot.outbound (créé dans bot.py)
+#               → bot.outbound.edit(message, content=...)          (sans attendre)
+#                 await bot.outbound.edit(message, priority=ANSWER, embed=...)
+#                 bot.outbound.submit(channel_id, lambda: coroutine, priority)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import heapq
+import itertools
+import time
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+ANSWER = 0        # 🥇 Résultats, réponses aux joueurs
+INTERACTIVE = 1   # 🖱️ Pagination, retours aux clics
+COSMETIC = 2      # ✨ Comptes à rebours, nettoyage de réactions
+
+SATURATION_PENDING = 5      # 📦 Au-delà de 5 appels en attente, le salon est saturé
+SATURATION_LATENCY = 1.0    # ⏳ … ou si un appel met en moyenne plus d’une seconde
+LATENCY_SMOOTHING = 0.3     # 📉 Poids du dernier appel dans la moyenne glissante
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Compteurs par salon
+# ────────────────────────────────────────────────────────────────────────────────
+class ChannelStats:
+    __slots__ = ("sent", "coalesced", "errors", "latency", "max_latency")
+
+    def __init__(self):
+        self.sent = 0            # 📤 Appels effectués
+        self.coalesced = 0       # 🔗 Éditions absorbées par une édition plus récente
+        self.errors = 0
+        self.latency = 0.0       # ⏱️ Durée moyenne d’un appel (les 429, attendus et réessayés
+                                 #    par discord.py, n’apparaissent qu’ici)
+        self.max_latency = 0.0
+
+    def record(self, elapsed: float):
+        self.sent += 1
+        self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+        self.max_latency = max(self.max_latency, elapsed)
+
+class _Job:
+    __slots__ = ("priority", "run", "future", "key", "fields", "done")
+
+    def __init__(self, priority, run, key=None, fields=None):
+        self.priority = priority
+        self.run = run
+        self.key = key
+        self.fields = fields
+        self.done = False
+        self.future = asyncio.get_running_loop().create_future()
+        # 🔇 Appels lancés sans attendre : l’erreur est déjà journalisée par le worker
+        self.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📤 Planificateur d’envois
+# ────────────────────────────────────────────────────────────────────────────────
+class OutboundScheduler:
+    """
+    📤 Une file par salon, traitée par une seule tâche à la fois (les appels d’un
+    même salon partagent la même limite de débit côté Discord) :
+    - les appels sont pris par priorité (ANSWER, INTERACTIVE, COSMETIC), puis dans l’ordre ;
+    - edit() fusionne les éditions d’un message encore en attente : les champs
+      s’additionnent, le plus récent l’emporte, la priorité la plus haute est gardée ;
+    - un compte à rebours sur un salon saturé saute donc les états intermédiaires
+      au lieu de s’empiler derrière la limite de débit.
+    """
+
+    def __init__(self):
+        self._queues = {}     # channel_id -> tas [(priorité, ordre, job)]
+        self._edits = {}      # message_id -> job d’édition en attente
+        self._workers = {}    # channel_id -> tâche
+        self._order = itertools.count()
+        self.channels = {}    # channel_id -> ChannelStats
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📝 Soumission
+    # ────────────────────────────────────────────────────────────────────────────
+    def _push(self, channel_id, job: _Job):
+        heapq.heappush(self._queues.setdefault(channel_id, []), (job.priority, next(self._order), job))
+        if channel_id not in self._workers:
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id))
+
+    def submit(self, channel_id, run, priority: int = INTERACTIVE) -> asyncio.Future:
+        """run() → coroutine, exécutée à son tour ; le futur donne son résultat."""
+        job = _Job(priority, run)
+        self._push(channel_id, job)
+        return job.future
+
+    def edit(self, message, priority: int = COSMETIC, **fields) -> asyncio.Future:
+        """message.edit(**fields), fusionné avec une édition du même message encore en attente."""
+        job = self._edits.get(message.id)
+        if job is not None:
+            job.fields.update(fields)
+            self.stats(message.channel.id).coalesced += 1
+            if priority < job.priority:
+                job.priority = priority
+                self._push(message.channel.id, job)  # 🔝 L’ancienne entrée du tas sera ignorée
+            return job.future
+
+        job = _Job(priority, None, key=message.id, fields=dict(fields))
+        job.run = lambda: message.edit(**job.fields)
+        self._edits[message.id] = job
+        self._push(message.channel.id, job)
+        return job.future
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔁 Traitement d’un salon
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _drain(self, channel_id):
+        heap = self._queues[channel_id]
+        stats = self.stats(channel_id)
+        try:
+            while heap:
+                priority, _, job = heapq.heappop(heap)
+                if job.done or priority != job.priority:
+                    continue  # Entrée remplacée (priorité relevée)
+                job.done = True
+                if job.key is not None and self._edits.get(job.key) is job:
+                    del self._edits[job.key]  # ✍️ Les éditions suivantes partiront après celle-ci
+
+                started = time.monotonic()
+                try:
+                    result = await job.run()
+                except Exception as e:
+                    stats.errors += 1
+                    print(f"[ERREUR OUTBOUND] Salon {channel_id} : {e}")
+                    job.future.set_exception(e)
+                else:
+                    job.future.set_result(result)
+                stats.record(time.monotonic() - started)
+        finally:
+            del self._workers[channel_id]
+            if not heap:
+                del self._queues[channel_id]
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📊 Mesures
+    # ────────────────────────────────────────────────────────────────────────────
+    def stats(self, channel_id) -> ChannelStats:
+        stats = self.channels.get(channel_id)
+        if stats is None:
+            stats = self.channels[channel_id] = ChannelStats()
+        return stats
+
+    def pending(self, channel_id) -> int:
+        return len({id(job) for _, _, job in self._queues.get(channel_id, ()) if not job.done})
+
+    def saturated(self, channel_id) -> bool:
+        """Vrai si le salon a trop d’appels en attente ou des appels trop lents."""
+        stats = self.channels.get(channel_id)
+        return (
+            self.pending(channel_id) >= SATURATION_PENDING
+            or (stats is not None and stats.latency >= SATURATION_LATENCY)
+        )
+
+    def summary(self) -> dict:
+        """Totaux tous salons confondus (pour !ping)."""
+        channels = self.channels.values()
+        return {
+            "sent": sum(s.sent for s in channels),
+            "coalesced": sum(s.coalesced for s in channels),
+            "pending": sum(self.pending(cid) for cid in self._queues),
+            "saturated": [cid for cid in self.channels if self.saturated(cid)],
+        }
@@ -0,0 +1,149 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 reminder_outbox.py — Envoi des rappels de tournoi par MP (file rappels_envois)
+# Objectif : Envoyer des centaines de MP rapidement sans dépasser les limites de
+#            Discord, réessayer les erreurs passagères, et ne supprimer un rappel
+#            qu’une fois son MP réellement envoyé
+# Utilisation : await ReminderOutbox(bot).dispatch(render)  (tâche de rappel)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import random
+import time
+
+import aiohttp
+import discord
+
+from utils.database import db
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+CLAIM_BATCH = 50       # 📥 Rappels réservés par requête
+DM_CONCURRENCY = 3     # 📨 MP en cours simultanément
+DM_INTERVAL = 0.25     # ⏱️ Au plus 4 MP par seconde (anti-spam des MP Discord)
+SEND_RETRIES = 3       # 🔁 Essais par MP pendant un même envoi
+BACKOFF_BASE = 2.0     # ⏳ Attente avant nouvel essai : 2 s, 4 s, 8 s (+ aléa)
+MAX_ATTEMPTS = 5       # 🚫 Au-delà (sur plusieurs envois), le rappel est abandonné
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📨 Outbox des rappels
+# ────────────────────────────────────────────────────────────────────────────────
+class ReminderOutbox:
+    """
+    📨 Vide la file rappels_envois (une ligne par inscrit et par échéance) :
+    - réservation par lots (claim_rappels) : deux instances ne traitent jamais le même rappel ;
+    - envois parallèles bornés et espacés ;
+    - erreurs passagères (5xx, 429, réseau) réessayées avec attente exponentielle ;
+    - succès → suppression du rappel ; échec → remis en file avec attempts + 1 ;
+      MP fermés ou compte introuvable → abandon immédiat (attempts = MAX_ATTEMPTS).
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._sem = asyncio.Semaphore(DM_CONCURRENCY)
+        self._pace_lock = asyncio.Lock()
+        self._next_send = 0.0
+        self._delivered = set()   # 🔑 MP envoyés dont la suppression en base a échoué
+
+    async def _pace(self):
+        """Espace les envois d’au moins DM_INTERVAL, toutes tâches confondues."""
+        async with self._pace_lock:
+            delay = self._next_send - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_send = time.monotonic() + DM_INTERVAL
+
+    @staticmethod
+    def _is_transient(error) -> bool:
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return True
+        return isinstance(error, discord.HTTPException) and (error.status == 429 or error.status >= 500)
+
+    @staticmethod
+    def _key(row: dict) -> tuple:
+        return (str(row["user_id"]), row["tournoi_date"], row["offset_key"])
+
+    async def _confirm(self, row: dict):
+        """
+        Supprime un rappel dont le MP est parti. Un échec est réessayé ici, jamais par
+        un nouvel envoi : si la ligne est reprise plus tard, seule la suppression est refaite.
+        """
+        key = self._key(row)
+        for attempt in range(SEND_RETRIES):
+            try:
+                await db.delete_rappel(row)
+                self._delivered.discard(key)
+                return
+            except Exception as e:
+                self._delivered.add(key)
+                print(f"[ERREUR RAPPEL] Suppression du rappel envoyé à {row['user_id']} : {e}")
+                await asyncio.sleep(BACKOFF_BASE * 2 ** attempt + random.uniform(0, 1))
+
+    async def _deliver(self, row: dict, user, message: str) -> str:
+        """Envoie un rappel ; retourne « envoyé », « remis » ou « abandonné »."""
+        user_id = row["user_id"]
+        attempts = row.get("attempts") or 0
+
+        if self._key(row) in self._delivered:
+            await self._confirm(row)  # ✅ Déjà envoyé : seule la suppression restait à faire
+            return "envoyé"
+
+        if user is None:
+            if self.bot.user_cache.is_missing(user_id):
+                await db.release_rappel(row, MAX_ATTEMPTS)
+                print(f"⚠️ Utilisateur {user_id} introuvable, rappel abandonné.")
+                return "abandonné"
+            # 🔁 fetch_user en échec (5xx, 429, délai) : nouvel essai plus tard
+            await db.release_rappel(row, attempts + 1)
+            return "remis"
+
+        async with self._sem:
+            for attempt in range(SEND_RETRIES):
+                await self._pace()
+                try:
+                    await user.send(message)
+                except discord.Forbidden:
+                    await db.release_rappel(row, MAX_ATTEMPTS)
+                    print(f"⚠️ Impossible d’envoyer un message à {user_id} (DM bloqués).")
+                    return "abandonné"
+                except Exception as e:
+                    if not self._is_transient(e):
+                        print(f"[ERREUR RAPPEL] {user_id} : {e}")
+                        break
+                    await asyncio.sleep(BACKOFF_BASE * 2 ** attempt + random.uniform(0, 1))
+                else:
+                    # 📬 MP parti : le rappel est livré, quoi qu’il arrive à la suppression
+                    await self._confirm(row)
+                    return "envoyé"
+
+        await db.release_rappel(row, attempts + 1)
+        return "remis"
+
+    async def dispatch(self, render) -> dict:
+        """
+        Envoie tous les MP en file ; render(ligne) donne le texte de chaque MP
+        (il dépend de l’échéance). Retourne le compte par résultat.
+        """
+        instance_id = self.bot.instance_lease.instance_id
+        counts = {"envoyé": 0, "remis": 0, "abandonné": 0}
+
+        while True:
+            rows = await db.claim_rappels(instance_id, CLAIM_BATCH)
+            if not rows:
+                break
+            users = await self.bot.user_cache.fetch_many(row["user_id"] for row in rows)
+            results = await asyncio.gather(
+                *(self._deliver(row, users.get(int(row["user_id"])), render(row)) for row in rows),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    # ☁️ Échec Supabase : le rappel reste réservé et sera repris plus tard
+                    print(f"[ERREUR RAPPEL] {result}")
+                    counts["remis"] += 1
+                else:
+                    counts[result] += 1
+        return counts
@@ -0,0 +1,90 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 round_pool.py — Réserve de manches de quiz préparées à l’avance
+# Objectif : Tirer la carte, les leurres, censurer la description et construire
+#            l’embed en tâche de fond, pour que !question et !illustration n’aient
+#            plus qu’à prendre une manche prête et l’envoyer
+# Utilisation : pool = RoundPool(bot, build) ; pool.start() (dans cog_load) ; round = await pool.get()
+#               build(store) → manche prête, ou None (carte inutilisable, on retire)
+#               prepare(manche) → travail asynchrone optionnel avant la mise en réserve
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+POOL_SIZE = 8          # 📦 Manches prêtes gardées en réserve
+BUILD_ATTEMPTS = 20    # 🎲 Tirages par manche avant d’abandonner (carte sans leurres…)
+RETRY_DELAY = 30       # 🔁 Catalogue vide ou erreur : nouvel essai après 30 secondes
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Réserve de manches
+# ────────────────────────────────────────────────────────────────────────────────
+class RoundPool:
+    """
+    📦 File bornée de manches prêtes, remplie par une tâche de fond :
+    - la tâche se bloque quand la file est pleine et reprend dès qu’une manche
+      est prise (remplissage au fil de la consommation) ;
+    - les manches sont construites depuis le catalogue en mémoire : un
+      rafraîchissement du catalogue ne ralentit pas les commandes ;
+    - si la réserve est vide (démarrage, rafale de parties), la manche est
+      construite immédiatement comme avant.
+    """
+
+    def __init__(self, bot, build, size: int = POOL_SIZE, prepare=None):
+        self.bot = bot
+        self.build = build
+        self.prepare = prepare    # ⏩ Ex. : rendu des images à l’avance (utils/art_cache.py)
+        self.queue = asyncio.Queue(maxsize=size)
+        self._task = None
+
+    async def _build_one(self):
+        """Une manche, ou None si le catalogue est vide ou aucun tirage n’aboutit."""
+        store = await self.bot.card_catalog.get_store()
+        if not store.cards:
+            return None
+        for _ in range(BUILD_ATTEMPTS):
+            round_ = self.build(store)
+            if round_ is not None:
+                return round_
+        return None
+
+    async def _run(self):
+        await self.bot.wait_until_ready()  # 🌐 Session HTTP et catalogue prêts
+        while True:
+            try:
+                round_ = await self._build_one()
+            except Exception as e:
+                print(f"[ERREUR RÉSERVE] {e}")
+                round_ = None
+            if round_ is None:
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            if self.prepare:
+                try:
+                    await self.prepare(round_)
+                except Exception as e:
+                    print(f"[ERREUR RÉSERVE] Préparation : {e}")
+            await self.queue.put(round_)
+
+    async def get(self):
+        """Manche prête (ou construite à la demande si la réserve est vide) ; None si impossible."""
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return await self._build_one()
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ▶️ Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────────
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,263 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 streak_buffer.py — Tampon d’écriture des séries (!question, !illustration)
+# Objectif : Sortir Supabase du chemin de réponse : chaque réponse est notée en
+#            mémoire (et dans un journal local, pour survivre à un crash), puis les
+#            deltas regroupés par joueur sont envoyés périodiquement en une requête
+# Utilisation : bot.streak_buffer (créé dans bot.py)
+#               → record("question", user_id, correct) ; await get_row(user_id)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.database import db
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache")
+JOURNAL_PATH = os.path.join(CACHE_DIR, "streaks.jsonl")            # 📝 Réponses pas encore envoyées
+FLUSHING_PATH = os.path.join(CACHE_DIR, "streaks.flushing.jsonl")  # 📤 Lot en cours d’envoi
+
+FLUSH_INTERVAL = 10   # ⏱️ Envoi au plus toutes les 10 secondes…
+FLUSH_SIZE = 100      # 📦 …ou dès que 100 joueurs ont des réponses en attente
+
+# 🎮 Colonnes de ygo_streaks par jeu : (série actuelle, meilleure série)
+GAMES = {
+    "question": ("current_streak", "best_streak"),
+    "illu": ("illu_streak", "best_illustreak"),
+}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧮 Delta de série
+# ────────────────────────────────────────────────────────────────────────────────
+# Résumé d’une suite de réponses d’un joueur (même format que apply_streak_deltas) :
+# - reset : au moins une mauvaise réponse ;
+# - prefix_run : bonnes réponses avant la première erreur (toutes, si reset est faux) ;
+# - max_run : plus longue série après la première erreur ;
+# - trailing_run : série en cours à la fin de la suite.
+StreakDelta = namedtuple("StreakDelta", ["reset", "prefix_run", "max_run", "trailing_run"])
+
+EMPTY = StreakDelta(False, 0, 0, 0)
+CORRECT = StreakDelta(False, 1, 0, 0)
+WRONG = StreakDelta(True, 0, 0, 0)
+
+def compose(a: StreakDelta, b: StreakDelta) -> StreakDelta:
+    """Delta équivalent à a puis b."""
+    if not b.reset:
+        if not a.reset:
+            return StreakDelta(False, a.prefix_run + b.prefix_run, 0, 0)
+        trailing = a.trailing_run + b.prefix_run
+        return StreakDelta(True, a.prefix_run, max(a.max_run, trailing), trailing)
+    if not a.reset:
+        return StreakDelta(True, a.prefix_run + b.prefix_run, b.max_run, b.trailing_run)
+    run = a.trailing_run + b.prefix_run
+    return StreakDelta(True, a.prefix_run, max(a.max_run, run, b.max_run), b.trailing_run)
+
+def apply_delta(delta: StreakDelta, current: int, best: int) -> tuple:
+    """(série actuelle, meilleure série) après application du delta."""
+    if not delta.reset:
+        current += delta.prefix_run
+        return current, max(best, current)
+    return delta.trailing_run, max(best, current + delta.prefix_run, delta.max_run)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📥 Tampon
+# ────────────────────────────────────────────────────────────────────────────────
+class StreakBuffer:
+    """
+    📥 Réponses en attente, regroupées par (jeu, joueur).
+    Un envoi fige le journal courant en un lot identifié (batch_id) : le lot est
+    renvoyé tel quel tant qu’il n’a pas été confirmé, et Supabase ignore un lot
+    déjà appliqué, donc un redémarrage ne compte jamais une réponse deux fois.
+    Le journal n’est écrit que par un thread dédié, dans l’ordre des appels :
+    record() ne fait aucune I/O disque sur la boucle asyncio.
+    """
+
+    def __init__(self, interval: float = FLUSH_INTERVAL, max_pending: int = FLUSH_SIZE):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = {}      # (jeu, user_id) -> StreakDelta
+        self._inflight = None   # (batch_id, {(jeu, user_id): StreakDelta}) non confirmé
+        self._confirmed = 0     # 🔢 Lots confirmés (une lecture qui en chevauche un est refaite)
+        self._journal = None    # 📝 Fichier ouvert, manipulé uniquement par le thread d’écriture
+        self._writer = None     # 🧵 Thread unique d’écriture du journal (ordre préservé)
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task = None
+        self.listeners = []     # 📣 Fonctions appelées avec les lignes à jour après chaque envoi
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ✍️ Enregistrement d’une réponse (aucune I/O réseau)
+    # ────────────────────────────────────────────────────────────────────────────
+    def record(self, game: str, user_id, correct: bool):
+        key = (game, str(user_id))
+        self._pending[key] = compose(self._pending.get(key, EMPTY), CORRECT if correct else WRONG)
+        if self._writer:
+            self._writer.submit(self._append, json.dumps({"g": game, "u": key[1], "c": int(correct)}) + "\n")
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔍 Lecture (valeur en base + réponses en attente)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def get_rows(self, user_ids) -> dict:
+        """{user_id: ligne ygo_streaks} tenant compte des réponses pas encore envoyées."""
+        user_ids = [str(uid) for uid in user_ids]
+        # 🔓 Sans le verrou : un envoi en cours ne bloque pas la lecture.
+        # Le lot non confirmé est peut-être déjà appliqué (réponse pas encore revenue,
+        # ou perdue) : la même requête dit s’il l’est. Si un lot est figé ou confirmé
+        # pendant la lecture, celle-ci est refaite.
+        while True:
+            confirmed, inflight = self._confirmed, self._inflight
+            rows, applied = await db.get_streaks(user_ids, inflight[0] if inflight else None)
+            if self._confirmed == confirmed and self._inflight is inflight:
+                break
+
+        # 🧮 Lot non confirmé (s’il n’est pas en base) puis réponses en attente, en mémoire
+        inflight = inflight[1] if inflight and not applied else {}
+        result = {}
+        for uid in user_ids:
+            row = dict(rows.get(uid) or {"user_id": uid})
+            touched = uid in rows
+            for game, (cur_col, best_col) in GAMES.items():
+                key = (game, uid)
+                delta = compose(inflight.get(key, EMPTY), self._pending.get(key, EMPTY))
+                if delta != EMPTY:
+                    touched = True
+                    row[cur_col], row[best_col] = apply_delta(delta, row.get(cur_col) or 0, row.get(best_col) or 0)
+            if touched:
+                result[uid] = row
+        return result
+
+    async def get_row(self, user_id):
+        """Ligne ygo_streaks d’un joueur (ou None s’il n’a jamais répondu)."""
+        return (await self.get_rows([user_id])).get(str(user_id))
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📤 Envoi
+    # ────────────────────────────────────────────────────────────────────────────
+    async def flush(self):
+        async with self._lock:
+            if self._inflight:
+                await self._send_inflight()
+            if not self._pending:
+                return
+
+            # 🔒 Figer le lot : le journal courant devient le fichier du lot (renommage atomique)
+            batch_id = str(uuid.uuid4())
+            self._inflight, self._pending = (batch_id, self._pending), {}
+            # 🧵 Soumis avant toute réponse suivante : celles-ci iront dans le nouveau journal
+            await asyncio.get_running_loop().run_in_executor(self._writer, self._rotate, batch_id)
+
+            await self._send_inflight()
+
+    async def _send_inflight(self):
+        batch_id, deltas = self._inflight
+        payload = [
+            {"user_id": uid, "game": game, **delta._asdict()}
+            for (game, uid), delta in deltas.items()
+        ]
+        rows = await db.apply_streak_deltas(batch_id, payload)
+        self._inflight = None
+        self._confirmed += 1
+        os.remove(FLUSHING_PATH)
+        for listener in self.listeners:
+            listener(rows)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[ERREUR STREAKS] Envoi différé : {e}")
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📂 Journal local
+    # ────────────────────────────────────────────────────────────────────────────
+    def _append(self, line: str):
+        try:
+            self._journal.write(line)
+            self._journal.flush()
+        except (OSError, ValueError) as e:
+            print(f"[ERREUR STREAKS] Journal : {e}")
+
+    def _rotate(self, batch_id: str):
+        """Le journal courant devient le fichier du lot (renommage atomique)."""
+        self._journal.write(json.dumps({"batch": batch_id}) + "\n")
+        self._journal.close()
+        os.replace(JOURNAL_PATH, FLUSHING_PATH)
+        self._journal = open(JOURNAL_PATH, "a", encoding="utf-8")
+
+    @staticmethod
+    def _read_journal(path) -> tuple:
+        """Relit un journal : (batch_id ou None, {(jeu, user_id): StreakDelta})."""
+        batch_id, deltas = None, {}
+        if not os.path.exists(path):
+            return batch_id, deltas
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue  # ✂️ Dernière ligne tronquée par un crash
+                if "batch" in event:
+                    batch_id = event["batch"]
+                    continue
+                key = (event["g"], event["u"])
+                deltas[key] = compose(deltas.get(key, EMPTY), CORRECT if event["c"] else WRONG)
+        return batch_id, deltas
+
+    def _replay(self):
+        """Recharge le lot non confirmé et les réponses en attente du précédent lancement."""
+        batch_id, deltas = self._read_journal(FLUSHING_PATH)
+        if deltas:
+            self._inflight = (batch_id or str(uuid.uuid4()), deltas)
+        elif os.path.exists(FLUSHING_PATH):
+            os.remove(FLUSHING_PATH)
+
+        _, self._pending = self._read_journal(JOURNAL_PATH)
+        if self._inflight or self._pending:
+            print(f"📝 Séries rejouées depuis le journal : {len(self._pending)} en attente, "
+                  f"lot non confirmé : {'oui' if self._inflight else 'non'}.")
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ▶️ Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────────
+    def start(self):
+        """Rejoue le journal puis lance l’envoi périodique (depuis la boucle asyncio)."""
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self._replay()
+        self._journal = open(JOURNAL_PATH, "a", encoding="utf-8")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="streak-journal")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Dernier envoi avant l’arrêt ; ce qui échoue reste dans le journal."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"[ERREUR STREAKS] Envoi final impossible, conservé dans le journal : {e}")
+        if self._writer:
+            writer, self._writer = self._writer, None
+            # 🧵 Après les écritures encore en file
+            await asyncio.get_running_loop().run_in_executor(writer, self._journal.close)
+            writer.shutdown(wait=False)
+            self._journal = None
@@ -0,0 +1,96 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 tournoi_info.py — Cache mémoire du prochain tournoi (table tournoi_info)
+# Objectif : Répondre à !tournoi sans requête Supabase : la ligne est gardée en
+#            mémoire avec son embed, remplacée dès que !tournoidate écrit une
+#            nouvelle date, et relue en fond après TTL (modifications externes)
+# Utilisation : bot.tournoi_info (créé dans bot.py)
+#               → await get() ; await set_date(iso) ; rendered(build)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import time
+
+from utils.database import db
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+DEFAULT_TTL = 15 * 60   # ⏳ Relecture de tournoi_info toutes les 15 minutes au plus
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📅 Cache du prochain tournoi
+# ────────────────────────────────────────────────────────────────────────────────
+class TournoiInfoCache:
+    """
+    📅 Dernière ligne de tournoi_info gardée en mémoire :
+    - premier appel : lecture Supabase (les appels concurrents attendent la même) ;
+    - ensuite : réponse immédiate ; passé le TTL, relecture en tâche de fond
+      (en cas d’échec, l’ancienne valeur est conservée) ;
+    - set_date() écrit en base puis remplace la valeur et l’embed en cache.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.info = None          # 📄 {"prochaine_date": ...} ou None (aucun tournoi)
+        self.loaded_at = None     # 🕒 Horodatage (monotonic) de la dernière lecture réussie
+        self._embed = None        # 🖼️ Embed de !tournoi construit pour self.info
+        self._lock = asyncio.Lock()
+        self._refresh_task = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def _store(self, info):
+        self.info = info
+        self.loaded_at = time.monotonic()
+        self._embed = None
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔍 Lecture
+    # ────────────────────────────────────────────────────────────────────────────
+    async def refresh(self):
+        """Relit tournoi_info si la valeur est périmée (une seule lecture à la fois)."""
+        async with self._lock:
+            # ⏳ Les appels qui attendaient le verrou profitent de la lecture qui vient d’aboutir
+            if not self.is_stale:
+                return self.info
+            started = time.monotonic()
+            info = await db.get_tournoi_info()
+            # ✍️ Une écriture pendant la lecture est plus récente : on la garde
+            if self.loaded_at is None or self.loaded_at < started:
+                self._store(info)
+            return self.info
+
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            print(f"[ERREUR TOURNOI INFO] {e}")
+
+    async def get(self):
+        """Prochain tournoi ; seul le tout premier appel attend Supabase."""
+        if self.loaded_at is None:
+            return await self.refresh()
+        if self.is_stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+        return self.info
+
+    def rendered(self, build):
+        """Embed de la valeur en cache ; build(info) n’est rappelé qu’après un changement."""
+        if self._embed is None:
+            self._embed = build(self.info)
+        return self._embed
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # ✍️ Écriture (!tournoidate)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def set_date(self, iso_date: str) -> list:
+        """Enregistre la date en base ; met le cache à jour si une ligne a été modifiée."""
+        rows = await db.set_tournoi_date(iso_date)
+        if rows:
+            self._store({"prochaine_date": rows[0].get("prochaine_date", iso_date)})
+        return rows
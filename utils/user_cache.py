@@ -0,0 +1,132 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 user_cache.py — Cache des utilisateurs Discord (id → nom, avatar)
+# Objectif : Afficher des noms et envoyer des MP sans un fetch_user (appel REST)
+#            par joueur : cache mémoire de discord.py d’abord, puis cache local
+#            alimenté par les événements gateway, et seulement en dernier recours
+#            des fetch_user concurrents mais bornés
+# Utilisation : bot.user_cache (créé dans bot.py)
+#               → get(user_id) ; display_name(user_id) ; await fetch_many(ids)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import time
+
+import discord
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 CONSTANTES
+# ────────────────────────────────────────────────────────────────────────────────
+USER_TTL = 6 * 60 * 60     # ⏳ Utilisateur gardé 6 heures
+MISSING_TTL = 60 * 60      # 🚫 Compte introuvable : pas de nouvel essai pendant 1 heure
+FETCH_CONCURRENCY = 5      # 🌐 fetch_user simultanés au maximum
+MAX_ENTRIES = 10000        # 🧹 Au-delà, les entrées expirées sont purgées
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 👤 Cache des utilisateurs
+# ────────────────────────────────────────────────────────────────────────────────
+class UserCache:
+    """
+    👤 Résolution id → discord.User en trois niveaux :
+    1. le cache de discord.py (membres des serveurs, intents.members) ;
+    2. un cache local avec TTL, alimenté par les événements gateway (départs de
+       membres, changements de profil) et par les fetch_user déjà faits ;
+    3. fetch_user, lancé en parallèle pour tous les manquants, sous sémaphore.
+    """
+
+    def __init__(self, bot, ttl: float = USER_TTL):
+        self.bot = bot
+        self.ttl = ttl
+        self._users = {}   # user_id -> (discord.User ou None si introuvable, expiration)
+        self._fetch_sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+        self._background = set()
+
+        bot.add_listener(self._on_member_remove, "on_member_remove")
+        bot.add_listener(self._on_user_update, "on_user_update")
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 📡 Alimentation par la gateway
+    # ────────────────────────────────────────────────────────────────────────────
+    def remember(self, user, ttl: float = None):
+        now = time.monotonic()
+        if len(self._users) >= MAX_ENTRIES:
+            self._users = {uid: entry for uid, entry in self._users.items() if entry[1] > now}
+        self._users[user.id] = (user, now + (ttl or self.ttl))
+
+    async def _on_member_remove(self, member):
+        # 🚪 Le membre peut sortir du cache de discord.py : on garde son profil
+        self.remember(member)
+
+    async def _on_user_update(self, before, after):
+        if after.id in self._users:
+            self.remember(after)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔍 Lecture (sans appel REST)
+    # ────────────────────────────────────────────────────────────────────────────
+    def get(self, user_id):
+        """discord.User en cache, ou None (introuvable ou pas encore résolu)."""
+        user_id = int(user_id)
+        user = self.bot.get_user(user_id)
+        if user:
+            return user
+        cached = self._users.get(user_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+
+    def display_name(self, user_id, guild=None) -> str:
+        """Nom à afficher (surnom du serveur si possible)."""
+        member = guild.get_member(int(user_id)) if guild else None
+        user = member or self.get(user_id)
+        return user.display_name if user else f"Utilisateur inconnu ({user_id})"
+
+    def is_missing(self, user_id) -> bool:
+        """Vrai si Discord a répondu que le compte n’existe pas (NotFound en cache)."""
+        cached = self._users.get(int(user_id))
+        return bool(cached and cached[0] is None and cached[1] > time.monotonic())
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🌐 Résolution des manquants
+    # ────────────────────────────────────────────────────────────────────────────
+    def _is_known(self, user_id: int) -> bool:
+        if self.bot.get_user(user_id):
+            return True
+        cached = self._users.get(user_id)
+        return bool(cached and cached[1] > time.monotonic())
+
+    async def _fetch(self, user_id: int):
+        async with self._fetch_sem:
+            if self._is_known(user_id):
+                return self.get(user_id)
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except discord.NotFound:
+                self._users[user_id] = (None, time.monotonic() + MISSING_TTL)
+                return None
+            self.remember(user)
+            return user
+
+    async def fetch_many(self, user_ids) -> dict:
+        """
+        {user_id (int): discord.User ou None} ; les manquants sont récupérés en parallèle.
+        None : compte introuvable (is_missing) ou échec temporaire de fetch_user.
+        """
+        ids = [int(uid) for uid in user_ids]
+        missing = [uid for uid in dict.fromkeys(ids) if not self._is_known(uid)]
+        if missing:
+            results = await asyncio.gather(*(self._fetch(uid) for uid in missing), return_exceptions=True)
+            for uid, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    print(f"[ERREUR USER CACHE] {uid} : {result}")
+        return {uid: self.get(uid) for uid in ids}
+
+    def prefetch(self, user_ids):
+        """Résout les manquants en tâche de fond (pour le prochain affichage)."""
+        if all(self._is_known(int(uid)) for uid in user_ids):
+            return
+        task = asyncio.create_task(self.fetch_many(user_ids))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)